@@ -1,6 +1,7 @@
 # article_source.py
 import logging
 
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
 
 from config import COLORS
@@ -26,6 +27,39 @@ def get_source_and_headers(source):
     return sourceColor, headers
 
 
+def style_header_cell(cell, color, size):
+    """
+    Style a cell of the header rows of a sheet.
+
+    Args:
+        cell (openpyxl.cell.Cell): Cell object.
+        color (str): String representing the color of the cell.
+        size (int): The size of the font.
+
+    Returns:
+        None
+    """
+    cell.font = Font(bold=True, color='FFFFFF', size=size)
+    cell.fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+    cell.alignment = Alignment(horizontal='center', vertical='center')
+
+
+def style_return_cell(cell):
+    """
+    Make a cell a link that returns to the index sheet.
+
+    Args:
+        cell (openpyxl.cell.Cell): Cell object.
+
+    Returns:
+        None
+    """
+    cell.hyperlink = '#Index!A1'
+    cell.font = Font(color='0000EE', underline='single', size=12)  # Blue, underlined text
+    cell.fill = PatternFill(start_color='808080', end_color='808080', fill_type='solid')  # Light gray fill
+    cell.alignment = Alignment(horizontal='center', vertical='center')
+
+
 def add_source_header(sheet, source, sourceColor):
     """
     Add the source header to the sheet.
@@ -46,14 +80,9 @@ def add_source_header(sheet, source, sourceColor):
         sheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
         source_cell = sheet.cell(row=1, column=1, value=stripped_source)
         return_cell = sheet.cell(row=1, column=3, value="Return to Index")
-        return_cell.hyperlink = '#Index!A1'
-        return_cell.font = Font(color='0000EE', underline='single', size=12)  # Blue, underlined text
-        return_cell.fill = PatternFill(start_color='808080', end_color='808080', fill_type='solid')  # Light gray fill
-        return_cell.alignment = Alignment(horizontal='center', vertical='center')
+        style_return_cell(return_cell)
 
-    source_cell.font = Font(bold=True, color='FFFFFF', size=16)
-    source_cell.fill = PatternFill(start_color=sourceColor, end_color=sourceColor, fill_type='solid')
-    source_cell.alignment = Alignment(horizontal='center', vertical='center')
+    style_header_cell(source_cell, sourceColor, 16)
 
 
 def add_headers(sheet, headers, headersColor):
@@ -70,14 +99,47 @@ def add_headers(sheet, headers, headersColor):
     """
     sheet.append(headers)
     for cell in sheet[2:2]:
-        cell.font = Font(bold=True, color='FFFFFF', size=14)
-        cell.fill = PatternFill(start_color=headersColor, end_color=headersColor, fill_type='solid')
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        style_header_cell(cell, headersColor, 14)
 
     sheet.freeze_panes = 'A3'
     sheet.auto_filter.ref = f"A2:C{sheet.max_row}"
 
 
+def append_write_only_headers(sheet, source):
+    """
+    Append the source header and the headers to a sheet of a write-only workbook, with the same layout as
+    add_source_header and add_headers.
+
+    Args:
+        sheet (openpyxl.worksheet._write_only.WriteOnlyWorksheet): Write-only sheet object.
+        source (str): Source string representing the type of articles.
+
+    Returns:
+        None
+    """
+    sourceColor, headers = get_source_and_headers(source)
+    headersColor = adjust_color(sourceColor, -20)  # Make the headers color a bit darker
+    # The sheet properties of a write-only sheet are written with its first row
+    sheet.freeze_panes = 'A3'
+    sheet.auto_filter.ref = "A2:C2"
+
+    source_cell = WriteOnlyCell(sheet, value=replace_dash_with_space(source))
+    style_header_cell(source_cell, sourceColor, 16)
+    if source.startswith("Daily-Updates"):
+        sheet.merged_cells.add('A1:C1')
+        sheet.append([source_cell])
+    else:
+        sheet.merged_cells.add('A1:B1')
+        return_cell = WriteOnlyCell(sheet, value="Return to Index")
+        style_return_cell(return_cell)
+        sheet.append([source_cell, None, return_cell])
+
+    header_cells = [WriteOnlyCell(sheet, value=header) for header in headers]
+    for cell in header_cells:
+        style_header_cell(cell, headersColor, 14)
+    sheet.append(header_cells)
+
+
 def replace_dash_with_space(source):
     """
     Replace dashes with spaces in the source string.
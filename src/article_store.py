@@ -0,0 +1,615 @@
+import datetime
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+
+from config import (ARTICLE_BLOOM_FILE, ARTICLE_INDEX_FILE, ARTICLE_JOURNAL_FILE, ARTICLE_RETENTION_DAYS,
+                    ARTICLE_SNAPSHOT_FILE, ARTICLE_STORE, ARTICLE_STORE_FILE, JOURNAL_COMPACT_THRESHOLD,
+                    SEEN_INDEX_BLOOM_BITS)
+from utils import PAST_ARTICLES_FILE, load_past_articles, split_article_line
+
+
+def retention_cutoff(today=None):
+    """
+    Get the first day of the retention window of the articles.
+
+    Args:
+        today (datetime.date): The current date.
+
+    Returns:
+        datetime.date: The first day of the window, or None if the articles are kept forever.
+    """
+    if not ARTICLE_RETENTION_DAYS:
+        return None
+    return (today or datetime.date.today()) - datetime.timedelta(days=ARTICLE_RETENTION_DAYS)
+
+
+def iso_date(date):
+    """
+    Convert the date of an article to an ISO 8601 date, which sorts in the order of the dates.
+
+    Args:
+        date (str): The date of the article in the format 'dd-mm-yy'.
+
+    Returns:
+        str: The date in the format 'YYYY-MM-DD', or None if the article has no valid date.
+    """
+    try:
+        return datetime.datetime.strptime(date, '%d-%m-%y').date().isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retained(date, cutoff):
+    """
+    Check if the date of an article is in the retention window.
+
+    Args:
+        date (str): The date of the article in the format 'dd-mm-yy'.
+        cutoff (datetime.date): The first day of the retention window, or None if the articles are kept forever.
+
+    Returns:
+        bool: True if the article is in the window. Articles without a valid date are always kept.
+    """
+    if cutoff is None:
+        return True
+    try:
+        return datetime.datetime.strptime(date, '%d-%m-%y').date() >= cutoff
+    except (TypeError, ValueError):
+        return True
+
+
+class SQLiteArticleStore:
+    """
+    SQLite store of every article seen from every source.
+
+    The primary key on (source, link) serves the check for new articles, so opening and closing the store costs the
+    same no matter how much history it keeps. The articles older than the retention window are evicted when the
+    store is opened, by a single delete on the index of their ISO dates.
+    """
+
+    def __init__(self, path=ARTICLE_STORE_FILE):
+        self.cutoff = retention_cutoff()
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                source TEXT NOT NULL,
+                link TEXT NOT NULL,
+                title TEXT,
+                date TEXT,
+                first_seen TEXT NOT NULL,
+                display_link TEXT,
+                date_iso TEXT,
+                PRIMARY KEY (source, link)
+            );
+            CREATE INDEX IF NOT EXISTS articles_first_seen ON articles (source, first_seen);
+        """)
+        self.connection.commit()
+        self.migrate_columns()
+        self.migrate_past_articles()
+        self.evict()
+
+    def migrate_columns(self):
+        """
+        Add the columns that were added to the articles table after the store was created.
+
+        The ISO dates of the articles stored before they were kept are filled in once.
+
+        Returns:
+            None
+        """
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(articles)")}
+        with self.connection:
+            if 'display_link' not in columns:
+                self.connection.execute("ALTER TABLE articles ADD COLUMN display_link TEXT")
+            if 'date_iso' not in columns:
+                self.connection.execute("ALTER TABLE articles ADD COLUMN date_iso TEXT")
+                rows = self.connection.execute("SELECT rowid, date FROM articles").fetchall()
+                self.connection.executemany("UPDATE articles SET date_iso = ? WHERE rowid = ?",
+                                            [(iso_date(date), rowid) for rowid, date in rows])
+            self.connection.execute("CREATE INDEX IF NOT EXISTS articles_date_iso ON articles (date_iso)")
+
+    def migrate_past_articles(self, path=PAST_ARTICLES_FILE):
+        """
+        Import the articles of the old past articles text file, once.
+
+        After the import, the text file is renamed, so it is not imported again.
+
+        Args:
+            path (str): The path of the past articles text file.
+
+        Returns:
+            None
+        """
+        if not os.path.exists(path):
+            return
+        past_articles = load_past_articles()
+        first_seen = datetime.datetime.now().isoformat(timespec='seconds')
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO articles (source, link, date, first_seen, date_iso) VALUES (?, ?, ?, ?, ?)",
+                [(source, link, date, first_seen, iso_date(date)) for source, articles in past_articles.items()
+                 for link, date in articles])
+        os.replace(path, path + '.migrated')
+        logging.info(f"Imported {sum(len(articles) for articles in past_articles.values())} past articles into the "
+                     f"article store.")
+
+    def evict(self):
+        """
+        Delete the articles dated before the retention window.
+
+        The articles without a valid date have no ISO date, so they are kept.
+
+        Returns:
+            None
+        """
+        if self.cutoff is None:
+            return
+        with self.connection:
+            evicted = self.connection.execute(
+                "DELETE FROM articles WHERE date_iso < ?", (self.cutoff.isoformat(),)).rowcount
+        if evicted:
+            logging.info(f"Evicted {evicted} articles older than the retention window from the article store.")
+
+    def is_new(self, source, link, date=None):
+        """
+        Check if an article of a source has not been seen before.
+
+        Args:
+            source (str): The name of the news source.
+            link (str): The link of the article.
+            date (str): The date of the article. Articles dated before the retention window are never new.
+
+        Returns:
+            bool: True if the article is new.
+        """
+        if not is_retained(date, self.cutoff):
+            return False
+        row = self.connection.execute(
+            "SELECT 1 FROM articles WHERE source = ? AND link = ?", (source, link)).fetchone()
+        return row is None
+
+    def add_articles(self, source, articles):
+        """
+        Insert or update the articles of a source.
+
+        The first time an article was seen is kept when it is updated.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): A list of tuples containing the title, link, and date of the articles, and optionally
+            the link as found on the page, which is shown instead of the canonical link when the workbook is rebuilt.
+
+        Returns:
+            None
+        """
+        first_seen = datetime.datetime.now().isoformat(timespec='seconds')
+        with self.connection:
+            self.connection.executemany(
+                """INSERT INTO articles (source, link, title, date, first_seen, display_link, date_iso)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (source, link) DO UPDATE SET title = excluded.title, date = excluded.date,
+                   display_link = COALESCE(excluded.display_link, display_link), date_iso = excluded.date_iso""",
+                [(source, article[1], article[0], article[2], first_seen, article[3] if len(article) > 3 else None,
+                  iso_date(article[2])) for article in articles])
+
+    def recent_links(self, source, limit=50):
+        """
+        Get the links of the latest articles seen from a source.
+
+        Args:
+            source (str): The name of the news source.
+            limit (int): The maximum number of links.
+
+        Returns:
+            list: The links of the articles, the most recently seen first.
+        """
+        # Articles seen at the same time were inserted in the order of the page, newest first
+        rows = self.connection.execute(
+            "SELECT link FROM articles WHERE source = ? ORDER BY first_seen DESC, rowid LIMIT ?", (source, limit))
+        return [row[0] for row in rows]
+
+    def recent_titles(self, days):
+        """
+        Get the titles of the articles of every source dated in the last days.
+
+        Args:
+            days (int): The number of days.
+
+        Returns:
+            list: The titles.
+        """
+        since = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        rows = self.connection.execute(
+            "SELECT title FROM articles WHERE date_iso >= ? AND title IS NOT NULL", (since,))
+        return [row[0] for row in rows]
+
+    def articles(self, source):
+        """
+        Iterate over the articles of a source, without loading them all.
+
+        The links are the links as found on the pages, or the canonical links of the articles stored without them.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            generator: Tuples containing the title, link, and date of the articles, the most recently seen first.
+        """
+        # Articles seen at the same time were inserted in the order of the page, newest first
+        yield from self.connection.execute(
+            "SELECT title, COALESCE(display_link, link), date FROM articles WHERE source = ? "
+            "ORDER BY first_seen DESC, rowid", (source,))
+
+    def close(self):
+        """
+        Close the connection to the store.
+
+        Returns:
+            None
+        """
+        self.connection.close()
+
+
+class JournalArticleStore:
+    """
+    Article store made of a sorted snapshot file and an append-only journal.
+
+    The snapshot has the format of the old 'past_articles.txt' file ('source|link|date' lines), sorted, so it is
+    memory-mapped and searched with a binary search instead of being loaded. Next to it, a SeenIndex of the hashes of
+    its articles answers the checks for new articles. The articles of every run are appended to the journal, which
+    is replayed at startup. Once the journal has more than JOURNAL_COMPACT_THRESHOLD lines, it is merged into a new
+    snapshot and index, which also evicts the articles older than the retention window. The merge runs in a thread
+    while the pages are fetched, and close() waits for it, so a run only waits for the part of the merge that takes
+    longer than the run itself.
+
+    A link can contain '|', so the lines are split at their first and last '|' with split_article_line.
+    """
+
+    def __init__(self, snapshot_path=ARTICLE_SNAPSHOT_FILE, journal_path=ARTICLE_JOURNAL_FILE,
+                 index_path=ARTICLE_INDEX_FILE, bloom_path=ARTICLE_BLOOM_FILE):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + '.compacting'
+        self.index_path = index_path
+        self.bloom_path = bloom_path if SEEN_INDEX_BLOOM_BITS else None
+        self.cutoff = retention_cutoff()
+        self.migrate_past_articles()
+        self.snapshot = None
+        self.snapshot_file = None
+        if os.path.exists(snapshot_path) and os.path.getsize(snapshot_path) > 0:
+            self.snapshot_file = open(snapshot_path, 'rb')
+            self.snapshot = mmap.mmap(self.snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = self.load_index()
+
+        # The journal tail: the articles that are not in the snapshot yet, in the order they were seen
+        self.tail = {}
+        journal_lines = self.replay(self.compacting_path) + self.replay(journal_path)
+        self.compaction = None
+        if journal_lines > JOURNAL_COMPACT_THRESHOLD and not os.path.exists(self.compacting_path):
+            os.replace(journal_path, self.compacting_path)
+            self.compaction = threading.Thread(target=self.compact, daemon=True)
+            self.compaction.start()
+        elif os.path.exists(self.compacting_path):
+            # A compaction of an earlier run did not finish, so it is done again
+            self.compaction = threading.Thread(target=self.compact, daemon=True)
+            self.compaction.start()
+        self.journal = open(journal_path, 'a', encoding='utf-8')
+
+    def migrate_past_articles(self, path=PAST_ARTICLES_FILE):
+        """
+        Turn the old past articles text file into the sorted snapshot, once.
+
+        After the migration, the text file is renamed, so it is not migrated again.
+
+        Args:
+            path (str): The path of the past articles text file.
+
+        Returns:
+            None
+        """
+        if not os.path.exists(path) or os.path.exists(self.snapshot_path):
+            return
+        with open(path, 'rb') as f:
+            lines = sorted({line.rstrip(b'\n') for line in f if line.count(b'|') >= 2})
+        with open(self.snapshot_path + '.tmp', 'wb') as f:
+            for line in lines:
+                f.write(line + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.snapshot_path + '.tmp', self.snapshot_path)
+        os.replace(path, path + '.migrated')
+        logging.info(f"Imported {len(lines)} past articles into the article snapshot.")
+
+    def load_index(self):
+        """
+        Load the index of the snapshot, and build it first if the snapshot has none yet.
+
+        Returns:
+            SeenIndex: The index of the articles of the snapshot.
+        """
+        # The index uses NumPy, which is only imported by the journal store
+        from seen_index import SeenIndex
+
+        if self.snapshot is None:
+            return SeenIndex()
+        if not os.path.exists(self.index_path) or (self.bloom_path and not os.path.exists(self.bloom_path)):
+            self.build_index(self.read_lines(self.snapshot_path), self.index_path, self.bloom_path)
+        return SeenIndex.load(self.index_path, self.bloom_path)
+
+    @staticmethod
+    def read_lines(path):
+        """
+        Read the complete 'source|link|date' lines of a snapshot or journal file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            generator: The lines as bytes, without the line break.
+        """
+        with open(path, 'rb') as f:
+            for line in f:
+                # The last line of a journal can be incomplete if a run crashed while writing it
+                if line.endswith(b'\n') and line.count(b'|') >= 2:
+                    yield line.rstrip(b'\n')
+
+    @staticmethod
+    def build_index(lines, index_path, bloom_path):
+        """
+        Build the index of the articles of snapshot lines and save it.
+
+        Args:
+            lines (iterable): The 'source|link|date' lines as bytes.
+            index_path (str): The path of the index file.
+            bloom_path (str): The path of the Bloom filter file, or None for no Bloom filter.
+
+        Returns:
+            None
+        """
+        from seen_index import SeenIndex, link_key
+
+        keys = (link_key(*split_article_line(line.decode('utf-8'))[:2]) for line in lines)
+        index = SeenIndex.from_keys(keys, SEEN_INDEX_BLOOM_BITS if bloom_path else 0)
+        index.save(index_path, bloom_path)
+
+    def replay(self, path):
+        """
+        Add the articles of a journal file to the journal tail.
+
+        Args:
+            path (str): The path of the journal file.
+
+        Returns:
+            int: The number of lines of the journal file.
+        """
+        count = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        source, link, date = split_article_line(line.rstrip('\n'))
+                    except ValueError:
+                        # The last line of a journal can be incomplete if a run crashed while writing it
+                        continue
+                    self.tail.setdefault(source, {})[link] = date
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def find(self, prefix):
+        """
+        Find the first line of the snapshot that is not smaller than a prefix.
+
+        Args:
+            prefix (bytes): The prefix to search for.
+
+        Returns:
+            int: The offset of the line in the snapshot.
+        """
+        low, high = 0, len(self.snapshot)
+        while low < high:
+            middle = (low + high) // 2
+            newline = self.snapshot.rfind(b'\n', low, middle)
+            start = low if newline == -1 else newline + 1
+            end = self.snapshot.find(b'\n', start)
+            end = len(self.snapshot) if end == -1 else end
+            if self.snapshot[start:end] < prefix:
+                low = end + 1
+            else:
+                high = start
+        return low
+
+    def is_new(self, source, link, date=None):
+        """
+        Check if an article of a source has not been seen before.
+
+        Args:
+            source (str): The name of the news source.
+            link (str): The link of the article.
+            date (str): The date of the article. Articles dated before the retention window are never new.
+
+        Returns:
+            bool: True if the article is new.
+        """
+        if not is_retained(date, self.cutoff):
+            return False
+        if link in self.tail.get(source, {}):
+            return False
+        return self.index.is_new(source, link)
+
+    def add_articles(self, source, articles):
+        """
+        Append the articles of a source to the journal.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): A list of tuples containing the title, link, and date of the articles.
+
+        Returns:
+            None
+        """
+        for article in articles:
+            self.journal.write(f"{source}|{article[1]}|{article[2]}\n")
+            self.tail.setdefault(source, {})[article[1]] = article[2]
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def snapshot_articles(self, source):
+        """
+        Get the articles of a source in the snapshot.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            list: Tuples containing the link and date of the articles, the newest first.
+        """
+        if self.snapshot is None:
+            return []
+        # The snapshot is sorted by its lines, which start with the source, so the articles of the source are next to
+        # each other. They are sorted by their dates below.
+        prefix = f"{source}|".encode('utf-8')
+        offset = self.find(prefix)
+        dated_links = []
+        while offset < len(self.snapshot) and self.snapshot[offset:offset + len(prefix)] == prefix:
+            end = self.snapshot.find(b'\n', offset)
+            end = len(self.snapshot) if end == -1 else end
+            link, date = self.snapshot[offset + len(prefix):end].decode('utf-8').rsplit('|', 1)
+            try:
+                dated_links.append((datetime.datetime.strptime(date, '%d-%m-%y'), link, date))
+            except ValueError:
+                dated_links.append((datetime.datetime.min, link, date))
+            offset = end + 1
+        dated_links.sort(reverse=True)
+        return [(link, date) for parsed_date, link, date in dated_links]
+
+    def recent_links(self, source, limit=50):
+        """
+        Get the links of the latest articles seen from a source.
+
+        Args:
+            source (str): The name of the news source.
+            limit (int): The maximum number of links.
+
+        Returns:
+            list: The links of the articles, the most recently seen first.
+        """
+        links = list(reversed(list(self.tail.get(source, {}))))[:limit]
+        if len(links) < limit:
+            links += [link for link, date in self.snapshot_articles(source)[:limit - len(links)]]
+        return links
+
+    def recent_titles(self, days):
+        """
+        Get the titles of the articles of every source dated in the last days.
+
+        The journal store does not keep the titles of the articles, so there are none.
+
+        Args:
+            days (int): The number of days.
+
+        Returns:
+            list: The titles.
+        """
+        return []
+
+    def articles(self, source):
+        """
+        Iterate over the articles of a source.
+
+        The journal store does not keep the titles of the articles, so they are None, nor the links as found on the
+        pages, so the links are the canonical links of the articles.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            generator: Tuples containing the title, link, and date of the articles, the most recently seen first.
+        """
+        tail = self.tail.get(source, {})
+        for link in reversed(list(tail)):
+            yield None, link, tail[link]
+        for link, date in self.snapshot_articles(source):
+            if link not in tail:
+                yield None, link, date
+
+    def compact(self):
+        """
+        Merge the snapshot and the sealed journal into a new sorted snapshot file and its index.
+
+        The new snapshot and index are written next to the current ones, and only replace them in close(), after the
+        current ones are unmapped.
+
+        Returns:
+            None
+        """
+        try:
+            # Keep a single line per article, the latest one
+            latest = {}
+            for path in (self.snapshot_path, self.compacting_path):
+                if os.path.exists(path):
+                    for line in self.read_lines(path):
+                        source, link, date = split_article_line(line, b'|')
+                        latest[(source, link)] = line
+            lines = sorted(line for line in latest.values()
+                           if is_retained(line.rsplit(b'|', 1)[1].decode('utf-8'), self.cutoff))
+            if len(lines) < len(latest):
+                logging.info(f"Evicted {len(latest) - len(lines)} articles older than the retention window from the "
+                             f"article snapshot.")
+            with open(self.snapshot_path + '.tmp', 'wb') as f:
+                for line in lines:
+                    f.write(line + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.build_index(lines, self.index_path + '.tmp', self.bloom_path and self.bloom_path + '.tmp')
+            logging.info(f"Compacted the article journal into a snapshot of {len(lines)} articles.")
+        except Exception as e:
+            logging.exception(f"Failed to compact the article journal: {e}")
+            for path in (self.snapshot_path, self.index_path, self.bloom_path):
+                if path and os.path.exists(path + '.tmp'):
+                    os.remove(path + '.tmp')
+
+    def close(self):
+        """
+        Close the journal, and wait for the compaction to finish if one is running, to replace the snapshot with it.
+
+        Returns:
+            None
+        """
+        self.journal.close()
+        # Release the memory-mapped index and snapshot, so they can be replaced
+        self.index = None
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot_file.close()
+        if self.compaction is not None:
+            self.compaction.join()
+            if os.path.exists(self.snapshot_path + '.tmp'):
+                # The sealed journal is only removed once the snapshot and its index have been replaced
+                for path in (self.index_path, self.bloom_path, self.snapshot_path):
+                    if path:
+                        os.replace(path + '.tmp', path)
+                os.remove(self.compacting_path)
+
+
+#  For a new article store, add its name with the store class to the below dictionary.
+stores = {
+    'sqlite': SQLiteArticleStore,
+    'journal': JournalArticleStore,
+}
+
+
+def create_article_store():
+    """
+    Create the article store selected in the configuration.
+
+    Returns:
+        SQLiteArticleStore or JournalArticleStore: The article store.
+    """
+    if ARTICLE_STORE not in stores:
+        raise ValueError(f"Unknown article store: {ARTICLE_STORE}")
+    return stores[ARTICLE_STORE]()
@@ -0,0 +1,574 @@
+"""
+Benchmarks of the performance sensitive parts of the project.
+
+Run a benchmark with 'python benchmarks.py <name>', e.g. 'python benchmarks.py seen_index'. The benchmarks use
+synthetic data or the saved pages of the fixtures directory and write their files to temporary directories. Their log
+messages are shown on the console instead of being appended to the log file. The parser_parity benchmark imports
+news_fetcher, which still opens the HTTP cache of the configuration.
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def synthetic_articles(count, seed=0):
+    """
+    Generate synthetic (source, link) pairs of articles.
+
+    Args:
+        count (int): The number of articles.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list: The (source, link) tuples.
+    """
+    rng = random.Random(seed)
+    sources = [f"Author {i}" for i in range(50)]
+    return [(rng.choice(sources), f"https://www.example.com/yazarlar/author/article-{rng.getrandbits(48):x}-{i}")
+            for i in range(count)]
+
+
+def synthetic_titles(count, seed=0):
+    """
+    Generate synthetic titles of random Turkish-looking words.
+
+    Args:
+        count (int): The number of titles.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        tuple: The titles, and the words they are made of.
+    """
+    rng = random.Random(seed)
+    letters = 'abcçdefgğhıijklmnoöprsştuüvyz'
+    words = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+    titles = [' '.join(rng.choice(words) for _ in range(rng.randint(5, 10))).capitalize() for _ in range(count)]
+    return titles, words
+
+
+def measure(function):
+    """
+    Measure the duration and the peak of the memory allocated by a function.
+
+    Args:
+        function (callable): The function to measure.
+
+    Returns:
+        tuple: The result of the function, its duration in seconds, and the peak of its allocations in bytes.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def benchmark_seen_index(count=1_000_000, lookups=100_000):
+    """
+    Compare a set of (source, link) tuples with a SeenIndex, for the memory of the seen articles and the speed of
+    their lookups.
+    """
+    from seen_index import SeenIndex, link_key
+
+    articles = synthetic_articles(count)
+    misses = synthetic_articles(lookups, seed=1)
+    hits = random.Random(2).sample(articles, lookups)
+
+    seen_set, duration, peak = measure(lambda: set(articles))
+    print(f"set:        built in {duration:.2f} s, {peak / 2 ** 20:.1f} MiB (without the strings)")
+    for name, queries in (('hits', hits), ('misses', misses)):
+        start = time.perf_counter()
+        for query in queries:
+            query in seen_set
+        print(f"set:        {len(queries) / (time.perf_counter() - start):,.0f} {name} lookups/s")
+
+    for bits in (0, 10):
+        index, duration, peak = measure(lambda: SeenIndex.from_keys((link_key(*a) for a in articles), bits))
+        print(f"SeenIndex (bloom bits {bits:>2}): built in {duration:.2f} s, {index.nbytes / 2 ** 20:.1f} MiB, "
+              f"peak {peak / 2 ** 20:.1f} MiB while building")
+        for name, queries in (('hits', hits), ('misses', misses)):
+            start = time.perf_counter()
+            for source, link in queries:
+                index.is_new(source, link)
+            print(f"SeenIndex (bloom bits {bits:>2}): {len(queries) / (time.perf_counter() - start):,.0f} {name} "
+                  f"lookups/s")
+
+
+def benchmark_near_duplicates(count=100_000, duplicates=1000):
+    """
+    Measure the signatures and the LSH clustering of near-duplicate titles, for a history of titles, and the grouping
+    of the new articles of a run against that history.
+    """
+    from near_duplicates import cluster_titles, group_near_duplicates, minhash_signatures
+
+    rng = random.Random(0)
+    titles, words = synthetic_titles(count)
+    # Near-duplicates: the same title with a word added
+    titles += [titles[i] + ' ' + rng.choice(words) for i in rng.sample(range(count), duplicates)]
+
+    _, duration, peak = measure(lambda: minhash_signatures(titles))
+    print(f"signatures: {len(titles):,} titles in {duration:.2f} s, peak {peak / 2 ** 20:.1f} MiB")
+    start = time.perf_counter()
+    clusters = cluster_titles(titles)
+    duration = time.perf_counter() - start
+    grouped = sum(1 for i, cluster in enumerate(clusters) if cluster != i)
+    print(f"clustering: {len(titles):,} titles in {duration:.2f} s, {grouped:,} titles grouped with an earlier one "
+          f"({duplicates:,} near-duplicates added)")
+
+    # The new articles of a run, half of them continuing stories of the history
+    new_articles = [('Author', titles[i] + ' ' + rng.choice(words), 'link') for i in rng.sample(range(count), 100)]
+    new_articles += [('Author', title, 'link') for title in synthetic_titles(100, seed=1)[0]]
+    start = time.perf_counter()
+    group_near_duplicates(new_articles, history_titles=titles[:count])
+    print(f"grouping: {len(new_articles)} new articles against {count:,} earlier titles in "
+          f"{time.perf_counter() - start:.2f} s")
+
+
+def synthetic_workbook(path, sources, rows):
+    """
+    Save a synthetic workbook with a sheet of articles per source, like the Excel file of the project.
+
+    Args:
+        path (str): The path of the workbook.
+        sources (list): The names of the sources.
+        rows (int): The number of articles of every sheet.
+
+    Returns:
+        None
+    """
+    from excel_writer import save_articles
+    from workbook_session import WorkbookSession
+
+    with WorkbookSession(path) as session:
+        save_articles([], 'Daily-Updates-01-01-24', session)
+        for source in sources:
+            save_articles([(f"Title {i} of {source}", f"https://www.example.com/{source}/{i}", '01-01-24')
+                           for i in range(rows)], source, session)
+
+
+def benchmark_workbook_session(sources=26, rows=50):
+    """
+    Compare saving the new articles of every source with a load and a save of the workbook per source, as before the
+    WorkbookSession, with a single WorkbookSession for the whole run.
+    """
+    from excel_writer import save_articles
+    from workbook_session import WorkbookSession
+
+    names = [f"Author-{i}" for i in range(sources)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'Up_To_Date_NEWS.xlsx')
+        synthetic_workbook(path, names, rows)
+        new_articles = [(f"New title of {source}", f"https://www.example.com/{source}/new", '02-01-24')
+                        for source in names]
+
+        start = time.perf_counter()
+        for source, article in zip(names, new_articles):
+            with WorkbookSession(path) as session:
+                save_articles([article], source, session)
+        print(f"a load and a save per source: {time.perf_counter() - start:.2f} s")
+
+        start = time.perf_counter()
+        with WorkbookSession(path) as session:
+            for source, article in zip(names, new_articles):
+                save_articles([article], source, session)
+        print(f"a single WorkbookSession:     {time.perf_counter() - start:.2f} s (load {session.timings['load']:.2f} s,"
+              f" save {session.timings['save']:.2f} s)")
+
+
+def benchmark_prepend_rows(rows=5000, new_rows=200):
+    """
+    Compare inserting the new rows of a 'Daily-Updates' sheet one at a time, as before prepend_rows, with
+    prepend_rows.
+    """
+    import openpyxl
+    from excel_sheet import prepend_rows
+
+    def daily_updates_sheet():
+        sheet = openpyxl.Workbook().active
+        sheet.append(['Daily Updates'])
+        sheet.append(['Author', 'Title', 'Link'])
+        for i in range(rows):
+            sheet.append([f"Author {i % 50}", f"Title {i}", f"https://www.example.com/article-{i}"])
+        return sheet
+
+    new = [(f"Author {i % 50}", f"New title {i}", f"https://www.example.com/new-article-{i}") for i in range(new_rows)]
+
+    sheet = daily_updates_sheet()
+    start = time.perf_counter()
+    for row in new[::-1]:
+        sheet.insert_rows(3)
+        for (i, value) in enumerate(row, start=1):
+            sheet.cell(row=3, column=i, value=value)
+    print(f"insert_rows per row: {new_rows} rows on top of {rows:,} in {time.perf_counter() - start:.2f} s")
+
+    sheet = daily_updates_sheet()
+    start = time.perf_counter()
+    prepend_rows(new, sheet)
+    print(f"prepend_rows:        {new_rows} rows on top of {rows:,} in {time.perf_counter() - start:.2f} s")
+
+    sheet = daily_updates_sheet()
+    start = time.perf_counter()
+    prepend_rows(new, sheet, limit=50)
+    print(f"prepend_rows:        {new_rows} rows on top of {rows:,}, truncated to 50 rows, in "
+          f"{time.perf_counter() - start:.2f} s")
+
+
+class SyntheticArticleStore:
+    """
+    Article store of synthetic articles of some sources, all dated today.
+    """
+
+    def __init__(self, sources, rows):
+        titles, _ = synthetic_titles(len(sources) * rows)
+        self.titles = {source: titles[i * rows:(i + 1) * rows] for i, source in enumerate(sources)}
+        self.date = time.strftime('%d-%m-%y')
+
+    def articles(self, source):
+        return ((title, f"https://www.example.com/{source}/{i}", self.date)
+                for i, title in enumerate(self.titles[source]))
+
+
+def benchmark_export_workbook(sources=26):
+    """
+    Compare rebuilding the Excel file from the article store in write-only mode with loading, modifying and saving
+    it, for a growing number of articles of the day in the 'Daily-Updates' sheet.
+    """
+    from excel_writer import save_articles
+    from workbook_export import export_workbook
+    from workbook_session import WorkbookSession
+
+    names = [f"Author-{i}" for i in range(sources)]
+    new_article = ("New title", "https://www.example.com/new", time.strftime('%d-%m-%y'))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'Up_To_Date_NEWS.xlsx')
+        for rows in (100, 1000):
+            store = SyntheticArticleStore(names, rows)
+            _, duration, peak = measure(lambda: export_workbook(store, names, path))
+            print(f"export_workbook:  {rows * sources:>6,} daily rows in {duration:5.2f} s, peak {peak / 2 ** 20:5.1f} MiB")
+
+            def load_modify_save():
+                with WorkbookSession(path) as session:
+                    save_articles([new_article], names[0], session)
+
+            _, duration, peak = measure(load_modify_save)
+            print(f"load-modify-save: {rows * sources:>6,} daily rows in {duration:5.2f} s, peak {peak / 2 ** 20:5.1f} MiB")
+
+
+# The modules that are slow to import, and are only imported when they are needed
+LAZY_MODULES = ['bs4', 'numpy', 'openpyxl', 'pandas', 'pyarrow']
+
+
+def benchmark_export_sinks(days=365, sources=26, per_day=3):
+    """
+    Measure the appends of the daily batches of new articles to the export sinks during a year, and the read of the
+    history of a month.
+    """
+    import datetime
+
+    from export_sinks import sinks
+
+    titles, _ = synthetic_titles(days * sources * per_day)
+    start_date = datetime.date(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as directory:
+        for name, sink_class in sinks.items():
+            try:
+                sink = sink_class(os.path.join(directory, name))
+            except ImportError as e:
+                print(f"{name:<8} skipped: {e}")
+                continue
+            append_durations = []
+            next_title = iter(titles).__next__
+            for day in range(days):
+                date = (start_date + datetime.timedelta(days=day)).strftime('%d-%m-%y')
+                for source in range(sources):
+                    batch = [(next_title(), f"https://example.com/{source}/{day}/{i}", date) for i in range(per_day)]
+                    start = time.perf_counter()
+                    sink.add_articles(f"Author-{source}", batch)
+                    append_durations.append(time.perf_counter() - start)
+            batches = len(append_durations) // 12
+            print(f"{name:<8} append: {sum(append_durations[:batches]) / batches * 1000:.2f} ms per batch in the "
+                  f"first month, {sum(append_durations[-batches:]) / batches * 1000:.2f} ms in the last month")
+            start = time.perf_counter()
+            records = sink.read_month('2024-06')
+            print(f"{name:<8} read:   {len(records)} articles of a month in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+# Saved author pages of every parser function, in 'fixtures/pages/<name>.html' for the parser function 'parse_<name>'
+FIXTURE_PAGES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'fixtures', 'pages')
+
+
+def fixture_links():
+    """
+    Get the links of the articles that every parser function finds in its fixture page.
+
+    Returns:
+        dict: A dictionary where the keys are the names of the parser functions and the values are the links.
+    """
+    from news_fetcher import parse_page, parsers
+
+    links = {}
+    for parser_name in parsers:
+        path = os.path.join(FIXTURE_PAGES_DIR, f"{parser_name[len('parse_'):]}.html")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                links[parser_name] = [link for title, link, date in parse_page(parser_name, f.read(), 'utf-8')]
+    return links
+
+
+def link_variants(link, host):
+    """
+    Get variants of the link of an article that point to the same article.
+
+    Args:
+        link (str): The link of the article, as found on its page.
+        host (str): The canonical host of the website.
+
+    Returns:
+        list: The link with tracking parameters, with a fragment, over 'http', of its AMP version, with or without a
+        trailing slash, with an uppercase host, under the aliases of the host and with the parameters of the rules of
+        the host that do not change the article.
+    """
+    from urllib.parse import urlsplit, urlunsplit
+
+    from canonical_url import host_aliases, host_rules
+
+    parts = urlsplit(link)
+    separator = '&' if parts.query else '?'
+    path = parts.path.rstrip('/')
+    variants = [
+        f"{link}{separator}utm_source=twitter&utm_medium=social&fbclid=IwAR0abc",
+        f"{link}#comments",
+        urlunsplit(parts._replace(scheme='http')),
+        urlunsplit(parts._replace(path='/amp' + path)),
+        urlunsplit(parts._replace(path=path + '/amp/')),
+        f"{link}{separator}amp=1",
+        urlunsplit(parts._replace(path=path if parts.path.endswith('/') else path + '/')),
+        urlunsplit(parts._replace(netloc=parts.netloc.upper())),
+    ]
+    variants += [urlunsplit(parts._replace(netloc=alias)) for alias, target in host_aliases.items() if target == host]
+    variants += [f"{link}{separator}{param}=1" for param in host_rules.get(host, {}).get('drop_params', ())]
+    return variants
+
+
+def benchmark_canonical_urls(repeat=1_000):
+    """
+    Check the canonicalization of the links that the parser functions find in their fixture pages, and measure it.
+
+    The canonical link of every link must keep its path, be on the host of the author pages of its parser function in
+    SOURCE_MAP, not change when it is canonicalized again, and be the canonical link of all the variants of the link
+    made by link_variants. The exit status is 1 if a link is canonicalized wrong, so it can be run as a regression test.
+    """
+    from urllib.parse import urlsplit
+
+    from canonical_url import canonicalize_url, host_aliases
+    from config import SOURCE_MAP
+
+    source_hosts = {}
+    for source in SOURCE_MAP.values():
+        host = urlsplit(source['url']).hostname
+        source_hosts.setdefault(source['parser'], set()).add(host_aliases.get(host, host))
+
+    failures = 0
+    links = []
+    pages = fixture_links()
+    for parser_name, parser_links in pages.items():
+        for link in parser_links:
+            canonical = canonicalize_url(link)
+            canonical_parts = urlsplit(canonical)
+            if canonical_parts.path != urlsplit(link).path.rstrip('/'):
+                print(f"{parser_name}: '{link}' lost its path in '{canonical}'")
+                failures += 1
+            if canonical_parts.hostname not in source_hosts.get(parser_name, ()):
+                print(f"{parser_name}: the host of '{canonical}' is not the host of its author pages "
+                      f"{sorted(source_hosts.get(parser_name, ()))}")
+                failures += 1
+            links += [(canonical, variant)
+                      for variant in [link, canonical] + link_variants(link, canonical_parts.hostname)]
+    for canonical, link in links:
+        if canonicalize_url(link) != canonical:
+            print(f"'{link}' was canonicalized as '{canonicalize_url(link)}', expected '{canonical}'")
+            failures += 1
+    print(f"{len(links)} variants of the links of {len(pages)} fixture pages checked, {failures} failures")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for canonical, link in links:
+            canonicalize_url(link)
+    print(f"{repeat * len(links) / (time.perf_counter() - start):,.0f} links/s")
+    if failures:
+        sys.exit(1)
+
+
+def benchmark_parser_parity(repeat=20):
+    """
+    Check that every parser function returns the same articles from its fixture page with the 'html.parser' and 'lxml'
+    HTML parsers, with the parse scopes used by the runs, and measure the parsing with both. The exit status is 1 if a
+    parser function returns different or no articles, so it can be run as a regression test.
+    """
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    from news_fetcher import parse_page, parsers
+
+    try:
+        BeautifulSoup('', 'lxml')
+    except FeatureNotFound:
+        print("lxml is not installed, so the pages are always parsed with 'html.parser'")
+        return
+
+    failures = 0
+    durations = {'html.parser': 0.0, 'lxml': 0.0}
+    for parser_name in parsers:
+        path = os.path.join(FIXTURE_PAGES_DIR, f"{parser_name[len('parse_'):]}.html")
+        if not os.path.exists(path):
+            print(f"{parser_name}: no fixture page at {path}")
+            failures += 1
+            continue
+        with open(path, 'rb') as f:
+            content = f.read()
+        results = {}
+        for html_parser in durations:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                results[html_parser] = parse_page(parser_name, content, 'utf-8', html_parser)
+            durations[html_parser] += time.perf_counter() - start
+        if not results['lxml']:
+            print(f"{parser_name}: no articles found in the fixture page")
+            failures += 1
+        elif results['html.parser'] != results['lxml']:
+            print(f"{parser_name}: the articles differ\n  html.parser: {results['html.parser']}\n"
+                  f"  lxml:        {results['lxml']}")
+            failures += 1
+    print(f"{len(parsers) - failures} of {len(parsers)} parser functions return the same articles with both parsers")
+    for html_parser, duration in durations.items():
+        print(f"{html_parser:<12} {duration / repeat * 1000:.1f} ms to parse the fixture pages")
+    if failures:
+        sys.exit(1)
+
+
+# A date string of every format of the parser functions, with its date
+DATE_FIXTURES = [
+    ('parse_hurriyet', '12 Ekim 2024 14:30', '2024-10-12'),
+    ('parse_sabah', '5 Şubat 2024 Pazartesi', '2024-02-05'),
+    ('parse_sozcu', '1 Ocak 2024', '2024-01-01'),
+    ('parse_ekonomim', '30 Nisan 2024', '2024-04-30'),
+    ('parse_10haber', '9 Mayıs 2024', '2024-05-09'),
+    ('parse_gazeteoksijen', '19 Ağustos 2024', '2024-08-19'),
+    ('parse_mahfiegilmez', 'Eylül 7, 2024', '2024-09-07'),
+    ('parse_haberturk', 'Güncelleme: 2024-03-15 09:05:00', '2024-03-15'),
+    ('parse_yetkinreport', '/2024/06/03/article-title/', '2024-06-03'),
+    ('parse_perspektif', '2024-11-21T08:00:00+03:00', '2024-11-21'),
+    ('parse_paraanaliz', '14 Kas 2024', '2024-11-14'),
+    ('parse_ugurses', '2024-07-02T10:15:00+03:00', '2024-07-02'),
+    ('parse_yenisafak', 'Aralık 3 2023, Pazar', '2023-12-03'),
+    ('parse_birgun', '28.02.2024 18:45', '2024-02-28'),
+    ('parse_gazeteduvar', 'Cumartesi, 12 Ekim 2024', '2024-10-12'),
+    ('parse_t24', '22 Haziran 2024', '2024-06-22'),
+]
+
+
+def benchmark_turkish_dates(pages=2000, per_page=50):
+    """
+    Check the date parsing against a date string of every format of the parser functions, and measure the parsing of
+    the dates of the pages, without and with the memo. The exit status is 1 if a date is parsed wrong, so it can be run
+    as a regression test.
+    """
+    import datetime
+
+    from turkish_dates import parse_turkish_date
+
+    failures = 0
+    for parser_name, date_string, expected in DATE_FIXTURES:
+        try:
+            date = parse_turkish_date(date_string)
+        except ValueError as e:
+            date = e
+        if date != datetime.date.fromisoformat(expected):
+            print(f"{parser_name}: '{date_string}' was parsed as {date}, expected {expected}")
+            failures += 1
+    print(f"{len(DATE_FIXTURES) - failures} of {len(DATE_FIXTURES)} date formats parsed correctly")
+
+    # The dates of a page repeat, since an author publishes a few articles a day
+    rng = random.Random(0)
+    date_strings = [date_string for _, date_string, _ in DATE_FIXTURES]
+    page_dates = [[rng.choice(date_strings) for _ in range(per_page)] for _ in range(pages)]
+    for name, parse in (('without the memo', parse_turkish_date.__wrapped__), ('with the memo', parse_turkish_date)):
+        parse_turkish_date.cache_clear()
+        start = time.perf_counter()
+        for dates in page_dates:
+            for date_string in dates:
+                parse(date_string)
+        duration = time.perf_counter() - start
+        print(f"{name:<17} {pages * per_page / duration:,.0f} dates/s")
+    if failures:
+        sys.exit(1)
+
+
+def benchmark_import_time():
+    """
+    Measure the import time of main.py with 'python -X importtime', and check that the slow modules are not imported
+    at startup. The exit status is 1 if one of LAZY_MODULES is imported, so it can be run as a regression test.
+
+    Importing main creates the logs and data directories next to the source directory and opens the HTTP cache, so
+    the modules are copied to a temporary directory and imported there, which leaves the logs and data untouched.
+    """
+    source_dir = os.path.dirname(os.path.realpath(__file__))
+    with tempfile.TemporaryDirectory() as directory:
+        copy_dir = os.path.join(directory, 'src')
+        os.makedirs(copy_dir)
+        for file_name in os.listdir(source_dir):
+            if file_name.endswith('.py'):
+                shutil.copy(os.path.join(source_dir, file_name), copy_dir)
+        # The first import compiles the copied modules, so only the second one is measured
+        subprocess.run([sys.executable, '-c', 'import main'], cwd=copy_dir, capture_output=True, check=True)
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                                cwd=copy_dir, capture_output=True, text=True, check=True)
+    # The lines have the format 'import time: <self us> | <cumulative us> | <indented module name>'
+    timings = []
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('imported package'):
+            _, cumulative, module = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                timings.append((int(cumulative), module.strip()))
+    total = next(cumulative for cumulative, module in reversed(timings) if module == 'main')
+    print(f"import main: {total / 1000:.0f} ms")
+    for cumulative, module in sorted(timings, reverse=True)[1:11]:
+        print(f"  {module:<40} {cumulative / 1000:6.1f} ms")
+
+    imported = sorted({module for cumulative, module in timings} & set(LAZY_MODULES))
+    if imported:
+        print(f"Imported at startup, though they should be imported lazily: {', '.join(imported)}")
+        sys.exit(1)
+
+
+#  For a new benchmark, add its name with the benchmark function to the below dictionary.
+benchmarks = {
+    'canonical_urls': benchmark_canonical_urls,
+    'seen_index': benchmark_seen_index,
+    'turkish_dates': benchmark_turkish_dates,
+    'export_sinks': benchmark_export_sinks,
+    'export_workbook': benchmark_export_workbook,
+    'import_time': benchmark_import_time,
+    'near_duplicates': benchmark_near_duplicates,
+    'parser_parity': benchmark_parser_parity,
+    'prepend_rows': benchmark_prepend_rows,
+    'workbook_session': benchmark_workbook_session,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a benchmark of the project.")
+    parser.add_argument('benchmark', choices=sorted(benchmarks), help="The name of the benchmark.")
+    args = parser.parse_args()
+    # Configured before the modules under test are imported, so the basicConfig of utils does not log to the log file
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    benchmarks[args.benchmark]()
@@ -0,0 +1,91 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from, on any website
+TRACKING_PARAMS_PATTERN = re.compile(r'^(?:utm_\w+|fbclid|gclid|dclid|yclid|msclkid|mc_cid|mc_eid|_ga|_gl|ref|ref_src)$',
+                                     re.IGNORECASE)
+
+# Query parameters of the AMP versions of the articles
+AMP_PARAMS = {'amp'}
+
+#  Other host names under which the articles of a website are served, e.g. with or without 'www.' or on a mobile
+#  subdomain, with the host name of the author pages in SOURCE_MAP. If the links of a website are found under another
+#  host name, add it to the below dictionary.
+host_aliases = {
+    'hurriyet.com.tr': 'www.hurriyet.com.tr',
+    'sabah.com.tr': 'www.sabah.com.tr',
+    'm.sabah.com.tr': 'www.sabah.com.tr',
+    'sozcu.com.tr': 'www.sozcu.com.tr',
+    'ekonomim.com': 'www.ekonomim.com',
+    'www.10haber.net': '10haber.net',
+    'www.gazeteoksijen.com': 'gazeteoksijen.com',
+    'mahfiegilmez.com': 'www.mahfiegilmez.com',
+    'mahfiegilmez.blogspot.com': 'www.mahfiegilmez.com',
+    'haberturk.com': 'www.haberturk.com',
+    'm.haberturk.com': 'www.haberturk.com',
+    'www.yetkinreport.com': 'yetkinreport.com',
+    'perspektif.online': 'www.perspektif.online',
+    'paraanaliz.com': 'www.paraanaliz.com',
+    'www.ugurses.net': 'ugurses.net',
+    'yenisafak.com': 'www.yenisafak.com',
+    'birgun.net': 'www.birgun.net',
+    'gazeteduvar.com.tr': 'www.gazeteduvar.com.tr',
+    'www.t24.com.tr': 't24.com.tr',
+    'm.t24.com.tr': 't24.com.tr',
+}
+
+#  Canonicalization rules of a specific website, under its host name. If the links of a website have variants that
+#  point to the same article, add a rule for them to the below dictionary:
+#  - 'drop_query': True if the articles of the website are identified by their path alone.
+#  - 'drop_params': The names of other query parameters that do not change the article.
+host_rules = {
+    'www.hurriyet.com.tr': {'drop_query': True},
+    'www.sabah.com.tr': {'drop_query': True},
+    'www.sozcu.com.tr': {'drop_query': True},
+    'www.haberturk.com': {'drop_query': True},
+    't24.com.tr': {'drop_query': True},
+    # Blogger adds 'm=1' to the links of its mobile pages
+    'www.mahfiegilmez.com': {'drop_params': {'m'}},
+}
+
+
+def canonicalize_url(url):
+    """
+    Get the canonical form of the link of an article, used to recognize the articles that were seen before.
+
+    The canonical link is still a working link: the scheme is always 'https', the host is lowercased, has no default
+    port and is replaced by the host it is an alias of in host_aliases, the path has no trailing slash and no 'amp'
+    segment of the AMP version of the article, the fragment and the tracking and AMP query parameters are removed and
+    the other query parameters are sorted. The rules of the host in host_rules are applied on top of that.
+
+    Args:
+        url (str): The link of the article, as found on its page.
+
+    Returns:
+        str: The canonical link, or the link unchanged if it is not an absolute http(s) link.
+    """
+    parts = urlsplit(url.strip())
+    if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+        return url
+    host = host_aliases.get(parts.hostname, parts.hostname)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    rules = host_rules.get(host, {})
+
+    # The AMP version of an article is at '/amp/<path>' or '<path>/amp'
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if segments and segments[0].lower() == 'amp':
+        segments = segments[1:]
+    if segments and segments[-1].lower() == 'amp':
+        segments = segments[:-1]
+    path = '/' + '/'.join(segments)
+
+    query = ''
+    if not rules.get('drop_query'):
+        drop_params = rules.get('drop_params', set())
+        params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                  if not TRACKING_PARAMS_PATTERN.match(name) and name.lower() not in AMP_PARAMS
+                  and name not in drop_params]
+        query = urlencode(sorted(params))
+
+    return urlunsplit(('https', host, path, query, ''))
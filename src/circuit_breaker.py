@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from config import BREAKER_COOLDOWN, BREAKER_STATE_FILE, BREAKER_THRESHOLD
+
+
+class CircuitBreaker:
+    """
+    Per-source circuit breaker.
+
+    After BREAKER_THRESHOLD consecutive failures, a source is skipped until BREAKER_COOLDOWN seconds have passed. It
+    is then probed again with a single request: a success closes the circuit, a failure keeps it open for another
+    cooldown. The state is persisted in a JSON file, so it carries over between runs.
+    """
+
+    def __init__(self, path=BREAKER_STATE_FILE, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = self.load()
+
+    def load(self):
+        """
+        Load the state of the circuit breaker from its file.
+
+        Returns:
+            dict: A dictionary where the keys are source names and the values are dictionaries with the number of
+            consecutive failures and the time the circuit was opened.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logging.error(f"Failed to load the circuit breaker state, starting with closed circuits: {e}")
+            return {}
+
+    def save(self):
+        """
+        Save the state of the circuit breaker to its file.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            state = dict(self.state)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(self.path + '.tmp', self.path)
+
+    def allow(self, source):
+        """
+        Check if a source may be fetched.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            bool: False if the circuit of the source is open and its cooldown has not passed yet, True otherwise.
+        """
+        with self.lock:
+            source_state = self.state.get(source)
+            if source_state is None or source_state['failures'] < self.threshold:
+                return True
+            return time.time() - source_state['opened_at'] >= self.cooldown
+
+    def record_success(self, source):
+        """
+        Close the circuit of a source after a successful fetch.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            if self.state.pop(source, None) is not None:
+                logging.info(f"Circuit of {source} closed after a successful fetch.")
+
+    def record_failure(self, source):
+        """
+        Count a failed fetch of a source, and open its circuit after too many consecutive failures.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            source_state = self.state.setdefault(source, {'failures': 0, 'opened_at': None})
+            source_state['failures'] += 1
+            if source_state['failures'] >= self.threshold:
+                source_state['opened_at'] = time.time()
+                logging.warning(f"Circuit of {source} opened after {source_state['failures']} consecutive failures, "
+                                f"it will be probed again in {self.cooldown} seconds.")
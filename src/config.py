@@ -27,6 +27,254 @@ SAVE_ON_DESKTOP = True
 Up_To_Date_NEWS_FILE = os.path.join(DESKTOP_DIR, 'Up_To_Date_NEWS.xlsx') if SAVE_ON_DESKTOP else os.path.join(DATA_DIR,
                                                                                                               'Up_To_Date_NEWS.xlsx')
 
+"""
+- MAX_ARTICLES_PER_SHEET: The number of latest articles kept in the sheet of every source. The 'Daily-Updates' sheet
+keeps every article of the day.
+"""
+
+MAX_ARTICLES_PER_SHEET = 50
+
+"""
+Configuration for the sharded output:
+
+- SHARDED_OUTPUT: If it's set to True, the sheet of every source is saved to its own Excel file in SHARD_DIR, and the
+'Daily-Updates' sheets of a month to an Excel file of the month. The Excel file at Up_To_Date_NEWS_FILE then only has
+the index sheet, which links to those files. A run only loads and saves the files that receive new articles.
+
+- SHARD_DIR: The directory of the Excel files of the sharded output, next to the Excel file. Without the sharded
+output, the finished 'Daily-Updates' sheets are archived there, to the same Excel file of their month.
+"""
+
+SHARDED_OUTPUT = False
+
+SHARD_DIR = os.path.join(os.path.dirname(Up_To_Date_NEWS_FILE), 'Up_To_Date_NEWS')
+
+"""
+Configuration for the export sinks:
+
+Besides the Excel file, the new articles of every run can be appended to files that are easy to load with pandas. The
+dates are stored as dates ('YYYY-MM-DD' in the text files), which sort in order, instead of 'dd-mm-yy' strings. The
+files are partitioned by the month of the articles, so the history of a month is read from its own files.
+
+- EXPORT_SINKS: The names of the export sinks. 'jsonl' appends the articles to a JSON Lines file per month, 'csv' to a
+CSV file per month, and 'parquet' writes a Parquet file per source and run in the directory of the month, which needs
+pyarrow.
+
+- EXPORT_DIR: The directory of the exported files.
+"""
+
+EXPORT_SINKS = []
+
+EXPORT_DIR = os.path.join(DATA_DIR, 'exports')
+
+"""
+Configuration for fetching the author pages:
+
+The author pages are fetched concurrently. Several authors are hosted on the same website (e.g. ekonomim.com,
+hurriyet.com.tr, sabah.com.tr), so the number of simultaneous requests to a single host is limited separately.
+
+- MAX_WORKERS: The maximum number of author pages fetched at the same time.
+
+- MAX_CONNECTIONS_PER_HOST: The maximum number of simultaneous requests sent to a single host.
+"""
+
+MAX_WORKERS = 16
+
+MAX_CONNECTIONS_PER_HOST = 2
+
+"""
+Configuration for the HTTP cache:
+
+The 'ETag' and 'Last-Modified' headers of every author page are stored between runs and sent back as 'If-None-Match'
+and 'If-Modified-Since'. If a page has not been modified since the last run, the website answers with '304 Not
+Modified' and the source is skipped.
+
+- HTTP_CACHE_BACKEND: The storage of the cache. 'sqlite' stores it in HTTP_CACHE_FILE, 'filesystem' stores a file per
+page in HTTP_CACHE_DIR. Set it to None to disable the cache.
+"""
+
+HTTP_CACHE_BACKEND = 'sqlite'
+
+HTTP_CACHE_FILE = os.path.join(DATA_DIR, 'http_cache.db')
+
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+
+"""
+Configuration for the page fingerprints:
+
+Many websites do not send the 'ETag' or 'Last-Modified' headers. For those, a fingerprint of every downloaded author
+page is stored between runs, after stripping the fragments that change on every request (scripts, ads, tokens). If the
+fingerprint of a page is the same as in the last run, the source is skipped without parsing the page.
+
+- FINGERPRINT_PAGES: Set it to False to parse every downloaded page.
+
+- FINGERPRINT_FILE: The file where the fingerprints are kept between runs.
+"""
+
+FINGERPRINT_PAGES = True
+
+FINGERPRINT_FILE = os.path.join(DATA_DIR, 'fingerprints.json')
+
+"""
+Configuration for timeouts, retries and the circuit breaker:
+
+- CONNECT_TIMEOUT / READ_TIMEOUT: The number of seconds to wait for the connection to a website, and for the website
+to send data, before the request fails.
+
+- REQUEST_DEADLINE: The number of seconds the page of a source may take in total, with the retries and the download
+of the content. READ_TIMEOUT applies to every read from the connection, so without it a website that keeps sending a
+few bytes at a time would hold a fetching thread forever.
+
+- MAX_RETRIES: The number of times a failed request is retried. Only timeouts, connection errors and '429' or '5xx'
+responses are retried.
+
+- RETRY_BACKOFF: The base number of seconds to wait before a retry. The wait is random (jittered) and doubles with
+every retry.
+
+- BREAKER_THRESHOLD: The number of consecutive failed runs after which a source is skipped.
+
+- BREAKER_COOLDOWN: The number of seconds a skipped source waits before it is tried again.
+
+- BREAKER_STATE_FILE: The file where the state of the circuit breaker is kept between runs.
+"""
+
+CONNECT_TIMEOUT = 5
+
+READ_TIMEOUT = 20
+
+REQUEST_DEADLINE = 60
+
+MAX_RETRIES = 2
+
+RETRY_BACKOFF = 1
+
+BREAKER_THRESHOLD = 3
+
+BREAKER_COOLDOWN = 6 * 60 * 60
+
+BREAKER_STATE_FILE = os.path.join(DATA_DIR, 'circuit_breaker.json')
+
+"""
+Configuration for parsing the author pages:
+
+- HTML_PARSER: The HTML parser used to build the tree that the parser functions work on. 'lxml' is a fast C parser,
+'html.parser' is the slower pure-Python parser of the standard library. If the selected parser is not installed,
+'html.parser' is used instead.
+"""
+
+HTML_PARSER = 'lxml'
+
+"""
+- PARSE_WORKERS: The number of processes that parse the downloaded pages. Parsing is CPU-bound, so with many sources,
+parsing in several processes uses all the cores of the machine. Set it to 0 to parse the pages in the fetching threads.
+"""
+
+PARSE_WORKERS = 0
+
+"""
+Configuration for streaming the author pages:
+
+The author pages list the newest articles first. For the parser functions in STREAMING_PARSERS, the page is downloaded
+in chunks, and as soon as a link that was already seen appears, the rest of the page is known: the download is stopped
+and only the part read so far is parsed. This saves most of the download of long archive pages. Only add a parser
+function if its pages do not link to older articles above the article list (e.g. in a 'most read' box).
+
+- STREAM_CHUNK_SIZE: The number of bytes read at a time.
+
+- STREAM_TAIL_BYTES: The number of bytes still read after the first seen link, so the markup of that article (e.g. its
+date) is complete.
+"""
+
+STREAMING_PARSERS = ['parse_sabah']
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+STREAM_TAIL_BYTES = 4 * 1024
+
+"""
+Configuration for the article store:
+
+Every article seen from every source is kept in the article store, which is used to find the new articles.
+
+- ARTICLE_STORE: 'sqlite' keeps the articles in the SQLite database ARTICLE_STORE_FILE. On the first run, the articles
+of the old 'past_articles.txt' file are imported into it. 'journal' appends the new articles of every run to
+ARTICLE_JOURNAL_FILE, and merges them from time to time into the sorted snapshot ARTICLE_SNAPSHOT_FILE. On the first
+run, the old 'past_articles.txt' file becomes the snapshot.
+
+- JOURNAL_COMPACT_THRESHOLD: The number of journal lines after which the journal is merged into the snapshot.
+
+- SEEN_INDEX_BLOOM_BITS: With the 'journal' store, the articles of the snapshot are looked up in a compact index of
+64-bit hashes (ARTICLE_INDEX_FILE), which is rebuilt with the snapshot. A Bloom filter of this many bits per article
+(ARTICLE_BLOOM_FILE) answers most lookups of new articles without searching the index. Set it to 0 to disable it.
+
+- ARTICLE_RETENTION_DAYS: The number of days an article is kept in the store after its date. Older articles are
+evicted, and are never treated as new, so an old article that comes back on a page is not saved again. Set it to 0 to
+keep the articles forever. The Excel file can only be rebuilt with --rebuild-workbook from the articles still in the
+store.
+"""
+
+ARTICLE_STORE = 'sqlite'
+
+ARTICLE_STORE_FILE = os.path.join(DATA_DIR, 'articles.db')
+
+ARTICLE_JOURNAL_FILE = os.path.join(DATA_DIR, 'past_articles.journal')
+
+ARTICLE_SNAPSHOT_FILE = os.path.join(DATA_DIR, 'past_articles.snapshot')
+
+ARTICLE_INDEX_FILE = os.path.join(DATA_DIR, 'past_articles.index.npy')
+
+ARTICLE_BLOOM_FILE = os.path.join(DATA_DIR, 'past_articles.bloom.npz')
+
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+SEEN_INDEX_BLOOM_BITS = 10
+
+ARTICLE_RETENTION_DAYS = 90
+
+"""
+Configuration for the grouping of near-duplicate titles:
+
+The same story is often covered by several authors on the same day. The articles of the 'Daily-Updates' sheet whose
+titles are near-duplicates are put next to each other.
+
+- GROUP_NEAR_DUPLICATES: Set it to False to keep the articles of the 'Daily-Updates' sheet in the order of the sources.
+
+- NEAR_DUPLICATE_SIMILARITY: The minimum similarity, between 0 and 1, of the character trigrams of two titles to group
+them.
+
+- NEAR_DUPLICATE_HISTORY_DAYS: The number of days of titles of the article store that the new titles are also compared
+with, so two new articles that continue the same earlier story are grouped, and the new articles of a story that was
+already covered are counted in the log. Only the SQLite store keeps the titles. Set it to 0 to only compare the new
+titles with each other.
+"""
+
+GROUP_NEAR_DUPLICATES = True
+
+NEAR_DUPLICATE_SIMILARITY = 0.5
+
+NEAR_DUPLICATE_HISTORY_DAYS = 30
+
+"""
+Configuration for the daemon mode ('python main.py --daemon'):
+
+In the daemon mode, the script keeps running and polls every source on its own interval, which adapts to how often
+the author publishes: daily authors are polled often, weekly authors rarely.
+
+- DAEMON_DEFAULT_INTERVAL: The number of seconds between two polls of a source, until its publishing cadence is known.
+
+- DAEMON_POLLS_PER_ARTICLE: The number of polls of a source in the usual gap between two of its articles.
+
+- DAEMON_MIN_INTERVAL / DAEMON_MAX_INTERVAL: The bounds of the number of seconds between two polls of a source.
+"""
+
+DAEMON_DEFAULT_INTERVAL = 60 * 60
+
+DAEMON_POLLS_PER_ARTICLE = 24
+
+DAEMON_MIN_INTERVAL = 15 * 60
+
+DAEMON_MAX_INTERVAL = 12 * 60 * 60
+
 """
 Configuration for Automated-News-Collector Sources:
 
@@ -1,11 +1,15 @@
 import logging
-import os
+import re
 
 import openpyxl
 from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
 
 from article_source import add_headers, add_source_header, adjust_color, get_source_and_headers
-from config import Up_To_Date_NEWS_FILE
+
+# The columns of the index sheet, and their widths
+INDEX_HEADERS = ['Author', 'Articles', 'Last Article', 'Last Fetch']
+
+INDEX_WIDTHS = [60, 14, 18, 32]
 
 
 def create_workbook():
@@ -63,81 +67,222 @@ def create_or_load_sheet(book, source):
     elif source.startswith('Daily-Updates'):
         sheet = create_sheet(book, source)
         book._sheets.sort(key=lambda sheet: sheet.title != source)
-        sheet.column_dimensions['A'].width = 15
-        sheet.column_dimensions['B'].width = 110
-        sheet.column_dimensions['C'].width = 110
+        set_column_widths(sheet, source)
     else:
         sheet = create_sheet(book, source)
-        sheet.column_dimensions['A'].width = 110
-        sheet.column_dimensions['B'].width = 110
-        sheet.column_dimensions['C'].width = 15
+        set_column_widths(sheet, source)
 
     return sheet
 
 
-def insert_rows(df, sheet):
+def set_column_widths(sheet, source):
     """
-    Insert rows from DataFrame to the sheet.
+    Set the widths of the columns of a sheet of articles.
 
     Args:
-        df (pandas.DataFrame): DataFrame object.
         sheet (openpyxl.Worksheet): Sheet object.
+        source (str): Source string.
+
+    Returns:
+        None
+    """
+    widths = (15, 110, 110) if source.startswith('Daily-Updates') else (110, 110, 15)
+    for (column, width) in zip('ABC', widths):
+        sheet.column_dimensions[column].width = width
+
+
+def prepend_rows(rows, sheet, limit=None, link_column=None):
+    """
+    Put new rows above the rows of the sheet, and keep at most a number of rows.
+
+    The new and the existing rows are merged in memory and the cells of the sheet are written in a single pass, instead
+    of shifting every cell of the sheet down for every new row and up for every deleted row. The cells keep their
+    styles, so only the rows added at the bottom of the sheet need to be formatted.
+
+    Args:
+        rows (list): The values of the new rows, the first one on top.
+        sheet (openpyxl.Worksheet): Sheet object.
+        limit (int): The maximum number of rows below the headers, or None to keep every row.
+        link_column (int): The column of the links, which are made clickable, or None.
+
+    Returns:
+        range: The numbers of the rows added to the sheet.
+    """
+    old_max_row = sheet.max_row
+    if not rows:
+        return range(old_max_row + 1, old_max_row + 1)
+    existing_rows = [list(row) for row in sheet.iter_rows(min_row=3, min_col=1, max_col=3, values_only=True)]
+    merged_rows = [list(row) for row in rows] + existing_rows
+    if limit is not None:
+        merged_rows = merged_rows[:limit]
+
+    for (i, row) in enumerate(merged_rows, start=3):
+        for (j, value) in enumerate(row, start=1):
+            cell = sheet.cell(row=i, column=j, value=value)
+            if j == link_column:
+                cell.hyperlink = value
+    # Remove the rows that were pushed beyond the limit at once
+    if old_max_row >= 3 + len(merged_rows):
+        sheet.delete_rows(3 + len(merged_rows), old_max_row - 2 - len(merged_rows))
+    return range(old_max_row + 1, 3 + len(merged_rows))
+
+
+def style_index_header(cell):
+    """
+    Style the header cell of the index sheet.
+
+    Args:
+        cell (openpyxl.cell.Cell): Cell object.
+
+    Returns:
+        None
+    """
+    cell.font = Font(name='Arial', size=16, bold=True, color='FFFFFF')
+    cell.fill = PatternFill(start_color='808080', end_color='808080', fill_type='solid')  # Gray fill
+    cell.alignment = Alignment(horizontal='center', vertical='center')
+
+
+def style_index_cell(cell):
+    """
+    Style a cell of a row of the index sheet.
+
+    Args:
+        cell (openpyxl.cell.Cell): Cell object in its row of the index sheet.
+
+    Returns:
+        None
+    """
+    cell.alignment = Alignment(horizontal='center', vertical='center')
+    cell.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'),
+                         bottom=Side(style='thin'))
+
+    # Apply striping
+    if cell.row % 2 == 0:
+        cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')  # Light gray fill
+
+
+def style_index_link(cell, sheet_name, target=None):
+    """
+    Make a cell of the index sheet a link to another sheet.
+
+    Args:
+        cell (openpyxl.cell.Cell): Cell object in its row of the index sheet.
+        sheet_name (str): The name of the sheet to link to.
+        target (str): The target of the link, or None for the sheet of the same workbook.
 
     Returns:
         None
     """
-    for (index, row) in list(df.iterrows())[::-1]:
-        sheet.insert_rows(3)
-        for (i, value) in enumerate(row.tolist(), start=1):
-            cell = sheet.cell(row=3, column=i, value=value)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+    if target is None:
+        target = f"#'{sheet_name}'!A1"
+    cell.value = f'=HYPERLINK("{target}", "{sheet_name}")'  # Add a formula that links to the other sheet
+    cell.style = 'Hyperlink'  # Make the cell look like a hyperlink
+    cell.font = Font(color='0000EE', underline='single', size=14)  # Blue, underlined text
+    style_index_cell(cell)
 
 
-def create_index_sheet():
+def add_index_headers(sheet):
     """
-    Create or update an index sheet with links to all other sheets.
+    Add the headers of the index sheet that are missing, e.g. in an index sheet that only has the 'Author' column.
+
+    Args:
+        sheet (openpyxl.Worksheet): The index sheet.
+
+    Returns:
+        None
+    """
+    for (column, (header, width)) in enumerate(zip(INDEX_HEADERS, INDEX_WIDTHS), start=1):
+        cell = sheet.cell(row=1, column=column)
+        if cell.value != header:
+            cell.value = header
+            style_index_header(cell)
+            sheet.column_dimensions[cell.column_letter].width = width
+
+
+def index_link_name(value):
+    """
+    Get the name of the sheet that a cell of the index sheet links to.
+
+    Args:
+        value (str): The value of the cell, a HYPERLINK formula.
+
+    Returns:
+        str: The name of the sheet, or None if the value is not a link.
+    """
+    match = re.search(r'"([^"]*)"\)$', value or '')
+    return match.group(1) if match else None
+
+
+def update_index_stats(sheet, row, source_stats):
+    """
+    Update the statistics of an author in its row of the index sheet.
+
+    Args:
+        sheet (openpyxl.Worksheet): The index sheet.
+        row (int): The row of the author.
+        source_stats (dict): The statistics of the author in the run: the number of 'new' articles, the date of the
+        'last_article' or None, and the 'status' of the fetch.
+
+    Returns:
+        None
+    """
+    count_cell, date_cell, status_cell = (sheet.cell(row=row, column=column) for column in (2, 3, 4))
+    count_cell.value = (count_cell.value or 0) + source_stats['new']
+    if source_stats['last_article']:
+        date_cell.value = source_stats['last_article']
+    status_cell.value = source_stats['status']
+
+
+def create_index_sheet(session, stats=None):
+    """
+    Create or update an index sheet with links to all other sheets, or to the Excel files of the sharded output, and
+    the statistics of every author.
+
+    The index sheet is updated in place: only the sheets that are not linked yet get a new row, and the statistics are
+    updated from the counters of the run, without reading the sheets of the authors. A row without an article count,
+    new or made before the counts were kept, reads it once from the sheet of its author, which already has the new
+    articles of the run. The count then grows with the new articles of every run.
+
+    The index sheet is only updated by the runs that save the workbook, which are the runs with new articles, so the
+    'Last Fetch' status of a run without any new article, e.g. one in which every fetch failed, is not shown.
+
+    Args:
+        session (WorkbookSession or ShardedWorkbookSession): The workbook session of the run.
+        stats (dict): A dictionary where the keys are source names and the values are their statistics in the run, as
+        described in update_index_stats.
 
     Returns:
         None
     """
     try:
-        if os.path.exists(Up_To_Date_NEWS_FILE):
-            book = openpyxl.load_workbook(Up_To_Date_NEWS_FILE)
-            if 'Index' in book.sheetnames:
-                sheet = book['Index']  # Load the existing index sheet
-                sheet.delete_rows(2, sheet.max_row)  # Delete all rows except the header
-            else:
-                sheet = book.create_sheet('Index', 1)  # Create a new sheet at the second position
-                sheet.append(['Author'])  # Add headers
-                sheet['A1'].font = Font(name='Arial', size=16, bold=True, color='FFFFFF')
-                sheet['A1'].fill = PatternFill(start_color='808080', end_color='808080', fill_type='solid')  # Gray fill
-                sheet['A1'].alignment = Alignment(horizontal='center', vertical='center')
-                sheet.column_dimensions['A'].width = 60
-
-            existing_authors = [cell.value for cell in sheet['A'] if cell.value != 'Author']
-            for other_sheet in book.sheetnames[2:]:  # Skip the Index sheet itself
-                if other_sheet not in existing_authors:
-                    sheet.append([other_sheet])  # Add the name of the other sheet
-                    link_cell = sheet.cell(row=sheet.max_row, column=1)
-                    link_cell.value = f'=HYPERLINK("#\'{other_sheet}\'!A1", "{other_sheet}")'  # Add a formula that links to the other sheet
-                    link_cell.style = 'Hyperlink'  # Make the cell look like a hyperlink
-                    link_cell.font = Font(color='0000EE', underline='single', size=14)  # Blue, underlined text
-                    link_cell.alignment = Alignment(horizontal='center', vertical='center')
-
-                    # Apply striping
-                    if link_cell.row % 2 == 0:
-                        link_cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')  # Light gray fill
-
-            # Apply border to the cells
-            thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-            for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row):
-                for cell in row:
-                    cell.border = thin_border
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-
-            book.save(Up_To_Date_NEWS_FILE)
+        book = session.book
+        if 'Index' in book.sheetnames:
+            sheet = book['Index']  # Load the existing index sheet
         else:
-            logging.info("Excel file does not exist yet. Index sheet will be created after the first run.")
+            sheet = book.create_sheet('Index', 1)  # Create a new sheet at the second position
+        add_index_headers(sheet)
+
+        rows = {index_link_name(cell.value): cell.row for cell in sheet['A'][1:]}
+        seeded_rows = set()
+        for (other_sheet, target) in session.index_links():
+            if other_sheet not in rows:
+                row = sheet.max_row + 1
+                style_index_link(sheet.cell(row=row, column=1), other_sheet, target)
+                for column in range(2, len(INDEX_HEADERS) + 1):
+                    style_index_cell(sheet.cell(row=row, column=column))
+                rows[other_sheet] = row
+            # The months of the 'Daily-Updates' sheets of the sharded output are not authors
+            count_cell = sheet.cell(row=rows[other_sheet], column=2)
+            if count_cell.value is None and not other_sheet.startswith('Daily-Updates'):
+                count_cell.value = session.article_count(other_sheet)
+                seeded_rows.add(other_sheet)
+
+        for source, source_stats in (stats or {}).items():
+            if source in rows:
+                # The count read from the sheet already has the new articles of the run
+                if source in seeded_rows:
+                    source_stats = dict(source_stats, new=0)
+                update_index_stats(sheet, rows[source], source_stats)
 
     except Exception as e:
         logging.exception(f"Error creating or updating index sheet: {e}")
@@ -1,194 +1,69 @@
-import logging
-import os
+from config import MAX_ARTICLES_PER_SHEET
+from excel_sheet import create_or_load_sheet, prepend_rows
+from sheet_styles import format_rows
 
-import openpyxl
-import pandas as pd
-from openpyxl.styles import Font, Border, Side, PatternFill, Alignment
 
-from config import Up_To_Date_NEWS_FILE
-from excel_sheet import create_workbook, create_or_load_sheet, insert_rows
-
-
-def make_links_clickable(sheet, source):
-    """
-    Make the links in the sheet clickable.
-
-    Args:
-        sheet (openpyxl.Worksheet): Sheet object.
-        source (str): Source string representing the type of articles.
-
-    Returns:
-        None
-    """
-    for row in sheet.iter_rows(min_row=3, max_row=sheet.max_row):
-        for (i, cell) in enumerate(row, start=1):
-            if (source.startswith('Daily-Updates') and i == 3) or (not source.startswith('Daily-Updates') and i == 2):
-                cell.hyperlink = cell.value
-                cell.style = 'Hyperlink'
-
-
-def limit_articles(sheet, source):
+def link_column(source):
     """
-    Limit the number of articles in the sheet.
+    Get the column of the links of the articles in the sheet.
 
     Args:
-        sheet (openpyxl.Worksheet): Sheet object.
         source (str): Source string representing the type of articles.
 
     Returns:
-        None
+        int: The number of the column.
     """
-    if not source.startswith('Daily-Updates'):
-        while sheet.max_row - 2 > 50:
-            sheet.delete_rows(sheet.max_row)
+    return 3 if source.startswith('Daily-Updates') else 2
 
 
-def apply_border_font(sheet, source):
+def article_limit(source):
     """
-    Apply the border and font to a specific sheet.
+    Get the maximum number of articles kept in the sheet.
 
     Args:
-        sheet (openpyxl.Worksheet): Sheet object.
         source (str): Source string representing the type of articles.
 
     Returns:
-        None
+        int: The maximum number of articles, or None if every article is kept.
     """
     if source.startswith('Daily-Updates'):
-        add_borders(sheet)
-        change_font_daily_updates(sheet)
-    else:
-        add_borders(sheet)
-        change_font_author(sheet)
+        return None
+    return MAX_ARTICLES_PER_SHEET
 
 
-def append_to_excel(df, source):
+def append_to_excel(articles, source, book):
     """
-    Insert the DataFrame to the Excel file.
+    Insert the articles to the workbook.
+
+    The rows already in the sheet keep their formatting, so only the rows added at its bottom are formatted.
 
     Args:
-        df (pandas.DataFrame): DataFrame object containing the articles.
+        articles (list): Tuples containing the title, link, and date of the articles, or the author, title, and link
+        of the articles of the 'Daily-Updates' sheet.
         source (str): Source string representing the type of articles.
+        book (openpyxl.Workbook): Workbook object.
 
     Returns:
         openpyxl.Workbook: The modified Workbook object.
     """
-    if os.path.exists(Up_To_Date_NEWS_FILE):
-        book = openpyxl.load_workbook(Up_To_Date_NEWS_FILE)
-    else:
-        book = create_workbook()
-
     sheet = create_or_load_sheet(book, source)
-    insert_rows(df, sheet)
-    make_links_clickable(sheet, source)
-    limit_articles(sheet, source)
-    apply_border_font(sheet, source)
-
-    for row in sheet.iter_rows(min_row=3, min_col=1, max_col=3):
-        for cell in row:
-            cell.alignment = Alignment(wrap_text=True, horizontal='center', vertical='center')
-
+    new_rows = prepend_rows(articles, sheet, article_limit(source), link_column(source))
+    format_rows(sheet, source, new_rows)
     return book
 
 
-def change_font_daily_updates(sheet):
-    """
-    Change the font of the titles and authors in the sheet for daily updates.
-
-    Args:
-        sheet (openpyxl.Worksheet): Sheet object.
-
-    Returns:
-        None
-    """
-    title_font = Font(name='Arial', size=14, bold=True)
-    author_font = Font(name='Times New Roman', size=12, italic=True)
-
-    try:
-        for (i, row) in enumerate(sheet.iter_rows(min_row=3, min_col=1, max_col=3), start=3):
-            for (j, cell) in enumerate(row, start=1):
-                if j == 1:
-                    cell.font = author_font
-                elif j == 2:
-                    cell.font = title_font
-
-                if i % 2 == 0:
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-                else:
-                    cell.fill = PatternFill(fill_type=None)
-    except Exception as e:
-        logging.exception(f"Error while changing font in sheet '{sheet.title}': {e}")
-        raise
-
-
-def change_font_author(sheet):
-    """
-    Change the font of the titles in the sheet for author updates.
-
-    Args:
-        sheet (openpyxl.Worksheet): Sheet object.
-
-    Returns:
-        None
-    """
-    title_font = Font(name='Arial', size=14)
-    date_font = Font(name='Consolas', size=12)
-
-    try:
-        for (i, row) in enumerate(sheet.iter_rows(min_row=3, min_col=1, max_col=3), start=3):
-            for (j, cell) in enumerate(row, start=1):
-                if j == 1:
-                    cell.font = title_font
-                elif j == 3:
-                    cell.font = date_font
-
-                if i % 2 == 0:
-                    cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-                else:
-                    cell.fill = PatternFill(fill_type=None)
-    except Exception as e:
-        logging.exception(f"Error while changing font in sheet '{sheet.title}': {e}")
-        raise
-
-
-def add_borders(sheet):
-    """
-    Add borders around the cells in the sheet.
-
-    Args:
-        sheet (openpyxl.Worksheet): Sheet object.
-
-    Returns:
-        None
+def save_articles(articles, source, session):
     """
-    A = 'thin'
-    thin_border = Border(left=Side(style=A), right=Side(style=A), top=Side(style=A), bottom=Side(style=A))
-
-    try:
-        for row in sheet.iter_rows(min_row=3, max_row=sheet.max_row):
-            for cell in row:
-                cell.border = thin_border
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-    except Exception as e:
-        logging.exception(f"Error while applying border to sheet '{sheet.title}': {e}")
-        raise
-
-
-def save_articles(articles, source):
-    """
-    Save articles to an Excel file.
+    Save articles to the workbook of a session where the sheet of the source is kept. The workbook is written to its
+    Excel file when the session ends.
 
     Args:
-        articles (list): List of articles to be saved.
+        articles (list): Tuples containing the title, link, and date of the articles, or the author, title, and link
+        of the articles of the 'Daily-Updates' sheet.
         source (str): Source string representing the type of articles.
+        session (WorkbookSession or ShardedWorkbookSession): The workbook session of the run.
 
     Returns:
         None
     """
-    if source.startswith('Daily-Updates'):
-        df = pd.DataFrame(articles, columns=['Source', 'Title', 'Link'])
-    else:
-        df = pd.DataFrame(articles, columns=['Title', 'Link', 'Date'])
-
-    book = append_to_excel(df, source)
-    book.save(Up_To_Date_NEWS_FILE)
+    append_to_excel(articles, source, session.book_for(source))
@@ -0,0 +1,308 @@
+import csv
+import datetime
+import json
+import logging
+import os
+import uuid
+
+from config import EXPORT_DIR, EXPORT_SINKS
+
+FIELDS = ['source', 'title', 'link', 'date', 'first_seen']
+
+
+def parse_date(date):
+    """
+    Parse the date of an article.
+
+    Args:
+        date (str): The date of the article in the format 'dd-mm-yy'.
+
+    Returns:
+        datetime.date: The date, or None if the article has no valid date.
+    """
+    try:
+        return datetime.datetime.strptime(date, '%d-%m-%y').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def article_records(source, articles, first_seen=None):
+    """
+    Get the records of the exported files for the new articles of a source, grouped by month.
+
+    Args:
+        source (str): The name of the news source.
+        articles (list): A list of tuples containing the title, link, and date of the articles.
+        first_seen (datetime.datetime): The time the articles were seen, by default now.
+
+    Returns:
+        dict: A dictionary where the keys are months in the format 'YYYY-MM' and the values are the records of the
+        articles of the month. The articles without a valid date are put in the month they were seen.
+    """
+    first_seen = first_seen or datetime.datetime.now().replace(microsecond=0)
+    months = {}
+    for title, link, date in articles:
+        date = parse_date(date)
+        record = {'source': source, 'title': title, 'link': link, 'date': date, 'first_seen': first_seen}
+        months.setdefault((date or first_seen).strftime('%Y-%m'), []).append(record)
+    return months
+
+
+def encode_record(record):
+    """
+    Convert the dates of a record to ISO 8601 strings, which sort in the order of the dates.
+
+    Args:
+        record (dict): The record of an article.
+
+    Returns:
+        dict: The record with the dates as strings.
+    """
+    return dict(record, date=record['date'].isoformat() if record['date'] else None,
+                first_seen=record['first_seen'].isoformat())
+
+
+def decode_record(record):
+    """
+    Convert the dates of a record read from a text file back to dates.
+
+    Args:
+        record (dict): The record of an article with the dates as strings.
+
+    Returns:
+        dict: The record with the dates as datetime.date and datetime.datetime.
+    """
+    return dict(record, date=datetime.date.fromisoformat(record['date']) if record['date'] else None,
+                first_seen=datetime.datetime.fromisoformat(record['first_seen']))
+
+
+class JSONLSink:
+    """
+    An export sink that appends the new articles to a JSON Lines file per month.
+    """
+
+    def __init__(self, directory=os.path.join(EXPORT_DIR, 'jsonl')):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def month_path(self, month):
+        return os.path.join(self.directory, f"{month}.jsonl")
+
+    def add_articles(self, source, articles):
+        """
+        Append the new articles of a source to the files of their months.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): A list of tuples containing the title, link, and date of the articles.
+
+        Returns:
+            None
+        """
+        for month, records in article_records(source, articles).items():
+            with open(self.month_path(month), 'a', encoding='utf-8') as file:
+                file.writelines(json.dumps(encode_record(record), ensure_ascii=False) + '\n' for record in records)
+
+    def read_month(self, month):
+        """
+        Read the articles of a month.
+
+        Args:
+            month (str): The month in the format 'YYYY-MM'.
+
+        Returns:
+            list: The records of the articles of the month.
+        """
+        if not os.path.exists(self.month_path(month)):
+            return []
+        with open(self.month_path(month), encoding='utf-8') as file:
+            return [decode_record(json.loads(line)) for line in file]
+
+
+class CSVSink:
+    """
+    An export sink that appends the new articles to a CSV file per month.
+    """
+
+    def __init__(self, directory=os.path.join(EXPORT_DIR, 'csv')):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def month_path(self, month):
+        return os.path.join(self.directory, f"{month}.csv")
+
+    def add_articles(self, source, articles):
+        """
+        Append the new articles of a source to the files of their months.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): A list of tuples containing the title, link, and date of the articles.
+
+        Returns:
+            None
+        """
+        for month, records in article_records(source, articles).items():
+            path = self.month_path(month)
+            is_new_file = not os.path.exists(path)
+            with open(path, 'a', encoding='utf-8', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=FIELDS)
+                if is_new_file:
+                    writer.writeheader()
+                writer.writerows(encode_record(record) for record in records)
+
+    def read_month(self, month):
+        """
+        Read the articles of a month.
+
+        Args:
+            month (str): The month in the format 'YYYY-MM'.
+
+        Returns:
+            list: The records of the articles of the month.
+        """
+        if not os.path.exists(self.month_path(month)):
+            return []
+        with open(self.month_path(month), encoding='utf-8', newline='') as file:
+            return [decode_record(record) for record in csv.DictReader(file)]
+
+
+class ParquetSink:
+    """
+    An export sink that writes the new articles of every run to a Parquet file in the directory of their month.
+
+    Parquet files cannot be appended to, so every batch is a new file of the month, with the 'date' column stored as a
+    date and the 'first_seen' column as a timestamp. When the first articles of a new month are written, the files of
+    the previous months are merged into a single file per month, so reading a past month opens one file. A month is
+    read back as a single table, e.g. with pandas.read_parquet. It needs pyarrow, which is imported when the sink is
+    created.
+    """
+
+    def __init__(self, directory=os.path.join(EXPORT_DIR, 'parquet')):
+        import pyarrow
+
+        self.directory = directory
+        self.schema = pyarrow.schema([('source', pyarrow.string()), ('title', pyarrow.string()),
+                                      ('link', pyarrow.string()), ('date', pyarrow.date32()),
+                                      ('first_seen', pyarrow.timestamp('s'))])
+        os.makedirs(directory, exist_ok=True)
+
+    def month_path(self, month):
+        return os.path.join(self.directory, f"month={month}")
+
+    def add_articles(self, source, articles):
+        """
+        Write the new articles of a source to new files in the directories of their months.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): A list of tuples containing the title, link, and date of the articles.
+
+        Returns:
+            None
+        """
+        import pyarrow
+        import pyarrow.parquet
+
+        for month, records in article_records(source, articles).items():
+            if not os.path.exists(self.month_path(month)):
+                os.makedirs(self.month_path(month))
+                self.compact()
+            first_seen = records[0]['first_seen'].strftime('%Y%m%dT%H%M%S')
+            path = os.path.join(self.month_path(month), f"{first_seen}-{source}-{uuid.uuid4().hex[:8]}.parquet")
+            pyarrow.parquet.write_table(pyarrow.Table.from_pylist(records, schema=self.schema), path)
+
+    def compact(self):
+        """
+        Merge the files of every month but the latest one into a single file per month.
+
+        Returns:
+            None
+        """
+        import pyarrow.parquet
+
+        months = sorted(os.listdir(self.directory))[:-1]
+        for month_dir in months:
+            month_path = os.path.join(self.directory, month_dir)
+            file_names = [file_name for file_name in os.listdir(month_path) if file_name.endswith('.parquet')]
+            if len(file_names) <= 1:
+                continue
+            table = pyarrow.parquet.read_table(month_path, schema=self.schema)
+            # The merged file is written under a hidden name, which pyarrow does not read, until it is complete
+            pyarrow.parquet.write_table(table, os.path.join(month_path, '.articles.parquet.tmp'))
+            os.replace(os.path.join(month_path, '.articles.parquet.tmp'), os.path.join(month_path, 'articles.parquet'))
+            for file_name in file_names:
+                if file_name != 'articles.parquet':
+                    os.remove(os.path.join(month_path, file_name))
+            logging.info(f"Merged {len(file_names)} Parquet files of {month_dir}.")
+
+    def read_month(self, month):
+        """
+        Read the articles of a month.
+
+        Args:
+            month (str): The month in the format 'YYYY-MM'.
+
+        Returns:
+            list: The records of the articles of the month.
+        """
+        import pyarrow.parquet
+
+        if not os.path.exists(self.month_path(month)):
+            return []
+        return pyarrow.parquet.read_table(self.month_path(month), schema=self.schema).to_pylist()
+
+
+#  For a new export format, add its name with the sink class to the below dictionary.
+sinks = {
+    'jsonl': JSONLSink,
+    'csv': CSVSink,
+    'parquet': ParquetSink,
+}
+
+
+def create_export_sinks():
+    """
+    Create the export sinks selected in the configuration.
+
+    The configuration is checked before anything is fetched, so an unknown sink stops the run before any article is
+    saved. A sink that cannot be created, e.g. the 'parquet' sink without pyarrow, is logged and left out, so it does
+    not keep the new articles from being saved and marked as seen.
+
+    Returns:
+        list: The export sinks.
+
+    Raises:
+        ValueError: If a sink of the configuration is unknown.
+    """
+    for name in EXPORT_SINKS:
+        if name not in sinks:
+            raise ValueError(f"Unknown export sink: {name}")
+    export_sinks = []
+    for name in EXPORT_SINKS:
+        try:
+            export_sinks.append(sinks[name]())
+        except Exception as e:
+            logging.exception(f"Error creating the export sink '{name}', the articles are not exported to it: {e}")
+    return export_sinks
+
+
+def export_articles(export_sinks, source, articles):
+    """
+    Add the new articles of a source to every export sink.
+
+    An export sink that fails is logged and skipped, since the articles are already saved to the Excel file.
+
+    Args:
+        export_sinks (list): The export sinks.
+        source (str): The name of the news source.
+        articles (list): A list of tuples containing the title, link, and date of the articles.
+
+    Returns:
+        None
+    """
+    for sink in export_sinks:
+        try:
+            sink.add_articles(source, articles)
+        except Exception as e:
+            logging.exception(f"Error exporting the articles of {source} to {type(sink).__name__}: {e}")
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+from config import FINGERPRINT_FILE
+
+# Fragments that change on every request of any page without changing its articles
+common_volatile_patterns = [
+    re.compile(rb'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(rb'<style\b.*?</style\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(rb'<noscript\b.*?</noscript\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(rb'<iframe\b.*?</iframe\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(rb'<!--.*?-->', re.DOTALL),
+    re.compile(rb'<(?:input|meta)\b[^>]*(?:csrf|token|nonce)[^>]*>', re.IGNORECASE),
+    re.compile(rb'\snonce="[^"]*"', re.IGNORECASE),
+    # Cache busting query strings of the assets
+    re.compile(rb'[?&](?:v|ver|version|t|ts|_)=[^"\'\s>&]*', re.IGNORECASE),
+]
+
+WHITESPACE_PATTERN = re.compile(rb'\s+')
+
+#  Volatile fragments of a specific website. If the pages of a website change on every request (e.g. an ad slot, a
+#  'last updated' clock, a session id), add a pattern matching them to the below dictionary, under the name of the
+#  parser function of the website.
+volatile_patterns = {
+    'parse_hurriyet': [
+        re.compile(rb'<div[^>]*class="[^"]*(?:advertorial|ad-container)[^"]*"[^>]*>.*?</div>', re.DOTALL),
+    ],
+    'parse_haberturk': [
+        re.compile(rb'/_next/static/[^/"]+/'),
+    ],
+    'parse_t24': [
+        re.compile(rb'/_next/static/[^/"]+/'),
+    ],
+    'parse_sozcu': [
+        re.compile(rb'<div[^>]*class="[^"]*(?:ad-container|reklam)[^"]*"[^>]*>.*?</div>', re.DOTALL),
+    ],
+}
+
+
+def fingerprint_page(content, parser_name=None):
+    """
+    Compute the fingerprint of a page, ignoring the fragments that change without changing the articles.
+
+    Args:
+        content (bytes): The content of the page.
+        parser_name (str): The name of the parser function of the page, used to select its volatile patterns.
+
+    Returns:
+        str: The SHA-256 hex digest of the normalized content.
+    """
+    for pattern in volatile_patterns.get(parser_name, []) + common_volatile_patterns:
+        content = pattern.sub(b'', content)
+    content = WHITESPACE_PATTERN.sub(b' ', content)
+    return hashlib.sha256(content).hexdigest()
+
+
+class FingerprintStore:
+    """
+    Fingerprints of the author pages of the last run.
+
+    Like the HTTP cache, the fingerprints of a run are only written by commit(), after the articles of the run have
+    been saved.
+    """
+
+    def __init__(self, path=FINGERPRINT_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.unchanged = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.fingerprints = json.load(f)
+        except FileNotFoundError:
+            self.fingerprints = {}
+        except json.JSONDecodeError as e:
+            logging.error(f"Failed to load the page fingerprints, all pages will be parsed: {e}")
+            self.fingerprints = {}
+
+    def is_unchanged(self, source, fingerprint):
+        """
+        Check if the page of a source has the same fingerprint as in the last run, and remember the new fingerprint.
+
+        Args:
+            source (str): The name of the news source.
+            fingerprint (str): The fingerprint of the page fetched in this run.
+
+        Returns:
+            bool: True if the page has not changed since the last run.
+        """
+        with self.lock:
+            if self.fingerprints.get(source) == fingerprint:
+                self.unchanged += 1
+                return True
+            self.pending[source] = fingerprint
+            return False
+
+    def discard(self, source):
+        """
+        Forget the fingerprint of the page of a source fetched in this run, so the page is parsed again next run.
+
+        Args:
+            source (str): The name of the news source.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.pending.pop(source, None)
+
+    def discard_pending(self):
+        """
+        Forget all the fingerprints of the pages fetched in this run, e.g. when its articles could not be saved.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.pending = {}
+            self.unchanged = 0
+
+    def commit(self):
+        """
+        Write the fingerprints of the run to the file.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.fingerprints.update(self.pending)
+            self.pending = {}
+            fingerprints = dict(self.fingerprints)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(fingerprints, f, ensure_ascii=False, indent=2)
+        os.replace(self.path + '.tmp', self.path)
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from config import HTTP_CACHE_BACKEND, HTTP_CACHE_DIR, HTTP_CACHE_FILE
+
+
+class CacheBackend:
+    """
+    Base class for the storage backends of the HTTP cache.
+
+    A backend stores the validators ('etag' and 'last_modified') of every author page, keyed by the URL of the page.
+    """
+
+    def get(self, url):
+        """
+        Get the validators stored for a URL.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            dict: The stored validators, or None if nothing is stored for the URL.
+        """
+        raise NotImplementedError
+
+    def set(self, url, entry):
+        """
+        Store the validators of a URL.
+
+        Args:
+            url (str): The URL of the page.
+            entry (dict): The validators of the page.
+
+        Returns:
+            None
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release the resources held by the backend.
+
+        Returns:
+            None
+        """
+
+
+class FileCacheBackend(CacheBackend):
+    """
+    Store the validators of every URL in a separate JSON file of a directory.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def set(self, url, entry):
+        path = self._path(url)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(dict(entry, url=url), f)
+        os.replace(path + '.tmp', path)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Store the validators of every URL in a single SQLite database.
+    """
+
+    def __init__(self, path=HTTP_CACHE_FILE):
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS http_cache (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)")
+        self.connection.commit()
+
+    def get(self, url):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT etag, last_modified FROM http_cache WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1]}
+
+    def set(self, url, entry):
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified) VALUES (?, ?, ?)",
+                (url, entry.get('etag'), entry.get('last_modified')))
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+#  For a new storage backend, add its name with the backend class to the below dictionary.
+backends = {
+    'filesystem': FileCacheBackend,
+    'sqlite': SQLiteCacheBackend,
+}
+
+
+class HTTPCache:
+    """
+    Conditional-GET cache for the author pages.
+
+    The validators of a page are only written to the backend by commit(), after the articles of the run have been
+    saved. If a run fails before that, the next run downloads the pages in full again instead of skipping articles
+    that were never saved.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.stats = {}
+
+    def conditional_headers(self, url):
+        """
+        Get the conditional request headers for a URL.
+
+        Args:
+            url (str): The URL that is going to be requested.
+
+        Returns:
+            dict: The 'If-None-Match' and 'If-Modified-Since' headers, if validators are stored for the URL.
+        """
+        entry = self.backend.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """
+        Remember the validators of a response until the next commit().
+
+        Args:
+            url (str): The requested URL.
+            response (requests.Response): The response of the request.
+
+        Returns:
+            None
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self.lock:
+                self.pending[url] = {'etag': etag, 'last_modified': last_modified}
+
+    def discard(self, url):
+        """
+        Forget the validators received for a URL during the run, so the page is downloaded in full again next run.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.pending.pop(url, None)
+
+    def discard_pending(self):
+        """
+        Forget all the validators received during the run, e.g. when its articles could not be saved.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            self.pending = {}
+            self.stats = {}
+
+    def record(self, source, hit):
+        """
+        Count a cache hit (304 Not Modified) or miss for a source.
+
+        Args:
+            source (str): The name of the news source.
+            hit (bool): True if the page was not modified since the last run.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            source_stats = self.stats.setdefault(source, {'hits': 0, 'misses': 0})
+            source_stats['hits' if hit else 'misses'] += 1
+
+    def commit(self):
+        """
+        Write the validators received during the run to the backend.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        for url, entry in pending.items():
+            self.backend.set(url, entry)
+
+    def log_stats(self):
+        """
+        Log the number of cache hits and misses of every source.
+
+        Returns:
+            None
+        """
+        for source, source_stats in self.stats.items():
+            logging.info(f"HTTP cache for {source}: {source_stats['hits']} hits, {source_stats['misses']} misses.")
+        hits = sum(source_stats['hits'] for source_stats in self.stats.values())
+        misses = sum(source_stats['misses'] for source_stats in self.stats.values())
+        logging.info(f"HTTP cache: {hits} hits, {misses} misses in total.")
+
+
+def create_http_cache():
+    """
+    Create the HTTP cache with the backend selected in the configuration.
+
+    Returns:
+        HTTPCache: The HTTP cache, or None if the cache is disabled.
+    """
+    if HTTP_CACHE_BACKEND is None:
+        return None
+    if HTTP_CACHE_BACKEND not in backends:
+        raise ValueError(f"Unknown HTTP cache backend: {HTTP_CACHE_BACKEND}")
+    return HTTPCache(backends[HTTP_CACHE_BACKEND]())
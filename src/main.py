@@ -1,12 +1,14 @@
+import argparse
 import datetime
 import logging
 import os
-import openpyxl
-from news_fetcher import fetch_news
-from config import SOURCES, Up_To_Date_NEWS_FILE
-from excel_writer import save_articles
-from excel_sheet import create_index_sheet
-from utils import load_past_articles, save_past_articles
+import time
+from news_fetcher import fetch_all_news, commit_page_state, discard_all_page_state
+from config import (GROUP_NEAR_DUPLICATES, NEAR_DUPLICATE_HISTORY_DAYS, SHARDED_OUTPUT, SOURCES,
+                    Up_To_Date_NEWS_FILE)
+from article_store import create_article_store
+from export_sinks import create_export_sinks, export_articles
+from scheduler import PollScheduler
 
 # Configure the logging system
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -26,83 +28,241 @@ def is_new_day(current_date, last_reset_date):
     return current_date != last_reset_date
 
 
-def reset_daily_updates_sheet(workbook, sheet_name):
+def reset_daily_updates_sheet(session, sheet_name):
     """
-    Reset the 'Daily-Updates' sheet because a new day has started.
+    Reset the 'Daily-Updates' sheet because a new day has started. The finished sheet is moved to the archive of its
+    month, so the workbook only keeps the sheet of the current day.
 
     Args:
-    workbook (openpyxl.workbook.workbook.Workbook): The workbook where the sheet is located.
+    session (WorkbookSession): The workbook session where the sheet is located.
     sheet_name (str): The name of the sheet to be reset.
     """
     logging.info(f"Resetting the 'Daily-Updates' sheet because a new day has started.")
-    del workbook[sheet_name]
-    workbook.save(Up_To_Date_NEWS_FILE)
+    session.archive_daily_updates(sheet_name)
 
 
-def process_articles(source, past_articles):
+def process_articles(source, current_articles, store):
     """
-    Fetch and process new articles for a given source.
+    Process the fetched articles of a given source and find the new ones.
+
+    The new articles are not added to the store here, since they are only saved once the workbook is.
 
     Args:
     source (str): The name of the news source.
-    past_articles (dict): A dictionary containing past articles for each source.
+    current_articles (list): A list of Article tuples containing the title, link, date, and canonical link of the
+    fetched articles, or None if the page of the source has not changed since the last run.
+    store (SQLiteArticleStore or JournalArticleStore): The store of the articles seen before.
 
     Returns:
-    list: A list of tuples containing the source, title, and link of new articles.
+    list: The Article tuples of the new articles.
     """
-    current_articles = fetch_news(source)
-    new_articles = [article for article in current_articles if
-                    (article[1], article[2]) not in past_articles.get(source, set())]
+    if current_articles is None:
+        logging.info(f"Skipping {source} because its page has not changed since the last run.")
+        return []
+
+    # Variants of the same link on a page are saved once. The links stored before the canonical links were introduced
+    # are kept as they were found on the page, so they are checked as well.
+    new_articles = {}
+    for article in current_articles:
+        if (article.canonical_link not in new_articles
+                and store.is_new(source, article.canonical_link, article.date)
+                and (article.link == article.canonical_link or store.is_new(source, article.link))):
+            new_articles[article.canonical_link] = article
+    new_articles = list(new_articles.values())
 
     if new_articles:
         logging.info(f"Found {len(new_articles)} new articles from {source}.")
-        save_articles(new_articles, source)
-        # Update the past articles with the current articles
-        past_articles[source] = set((article[1], article[2]) for article in current_articles)
-        # Add the new articles published today to the daily updates articles
-        current_date = datetime.datetime.now().strftime("%d-%m-%y")
-        daily_updates_articles = [(source, article[0], article[1]) for article in new_articles if
-                                  article[2] == current_date]
-        return daily_updates_articles
     else:
         logging.info(f"No new articles found from {source}.")
-        return []
+    return new_articles
 
 
-def main():
+def fetch_stats(current_articles, new_articles):
     """
-    Main function that fetches news from each source, saves new articles, and updates the Excel file.
+    Count the statistics of every source in the run, which are shown in the index sheet.
+
+    Args:
+    current_articles (dict): A dictionary where the keys are source names and the values are the fetched articles, or
+    None for the sources whose pages have not changed since the last run.
+    new_articles (dict): A dictionary where the keys are source names and the values are the Article tuples of their
+    new articles.
+
+    Returns:
+    dict: A dictionary where the keys are source names and the values are dictionaries with the number of 'new'
+    articles, the date of the 'last_article' (the first new one, since the pages list the newest articles first) or
+    None, and the 'status' of the fetch.
+    """
+    fetch_time = datetime.datetime.now().strftime("%d-%m-%y %H:%M")
+    stats = {}
+    for source, articles in new_articles.items():
+        if current_articles[source] is None:
+            status = "Not modified"
+        elif not current_articles[source]:
+            status = "Failed"
+        else:
+            status = "OK"
+        stats[source] = {'new': len(articles), 'last_article': articles[0].date if articles else None,
+                         'status': f"{status}, {fetch_time}"}
+    return stats
+
+
+def save_workbook(new_articles, current_date, stats=None, history_titles=()):
+    """
+    Save the new articles to the Excel file, with a single load and save of the workbook.
+
+    Args:
+    new_articles (dict): A dictionary where the keys are source names and the values are the Article tuples of their
+    new articles.
+    current_date (str): The current date in the format "dd-mm-yy".
+    stats (dict): The statistics of every source in the run, as returned by fetch_stats, shown in the index sheet.
+    history_titles (list): The titles of earlier articles, which the near-duplicate titles are also compared with.
+    """
+    # The Excel modules import openpyxl, which is slow to import, so it is only imported by the runs that save articles
+    from excel_sheet import create_index_sheet
+    from excel_writer import save_articles
+    from workbook_session import create_workbook_session
+
+    # The workbook is loaded once, and saved once after all the sheets are updated
+    with create_workbook_session() as session:
+        # Get the name of the first sheet and extract the date from it. The sharded output keeps the 'Daily-Updates'
+        # sheets of the month in their own Excel file, so they are not reset.
+        if session.book.sheetnames and session.book.sheetnames[0].startswith('Daily-Updates'):
+            first_sheet_name = session.book.sheetnames[0]
+            last_reset_date = first_sheet_name.split("Daily-Updates-")[-1]
+            if is_new_day(current_date, last_reset_date):
+                reset_daily_updates_sheet(session, first_sheet_name)
+
+        daily_updates_articles = []
+        for source, articles in new_articles.items():
+            if articles:
+                save_articles([article[:3] for article in articles], source, session)
+            # Add the new articles published today to the daily updates articles
+            daily_updates_articles.extend((source.replace('-', ' '), article.title, article.link) for article in articles
+                                          if article.date == current_date)
+
+        # Save the daily updates articles to the daily updates sheet
+        if GROUP_NEAR_DUPLICATES and daily_updates_articles:
+            from near_duplicates import group_near_duplicates
+            daily_updates_articles = group_near_duplicates(daily_updates_articles, history_titles=history_titles)
+        logging.debug(f"Successfully fetched {len(daily_updates_articles)} articles dated {current_date}.")
+        # The sharded output only touches the Excel files that receive new articles
+        if daily_updates_articles or not SHARDED_OUTPUT:
+            save_articles(daily_updates_articles, f"Daily-Updates-{current_date}", session)
+        create_index_sheet(session, stats)
+
+
+def run(sources):
+    """
+    Fetch news from the given sources, save new articles, and update the Excel file.
+
+    Args:
+    sources (list): The names of the news sources to fetch news from.
+
+    Returns:
+    dict: A dictionary where the keys are source names and the values are the fetched articles, or None for the
+    sources whose pages have not changed since the last run.
     """
     # Get the current date
     current_date = datetime.datetime.now().strftime("%d-%m-%y")
 
-    # Check if the Excel file exists
-    if os.path.exists(Up_To_Date_NEWS_FILE):
-        # If the file exists, load it
-        workbook = openpyxl.load_workbook(Up_To_Date_NEWS_FILE)
-        # Get the name of the first sheet and extract the date from it
-        first_sheet_name = workbook.sheetnames[0]
-        last_reset_date = first_sheet_name.split("Daily-Updates-")[-1]
-        if is_new_day(current_date, last_reset_date):
-            reset_daily_updates_sheet(workbook, first_sheet_name)
+    # The export sinks are created before fetching, so an error in their configuration stops the run before saving
+    export_sinks = create_export_sinks()
+
+    # Fetch news from all sources concurrently, then save the new articles to the workbook at once
+    store = create_article_store()
+    try:
+        seen_links = {source: store.recent_links(source) for source in sources}
+        current_articles = fetch_all_news(sources, seen_links)
+        unchanged_sources = [source for source in sources if current_articles[source] is None]
+        logging.info(f"Short-circuited {len(unchanged_sources)} of {len(sources)} sources whose pages have not "
+                     f"changed since the last run.")
+        new_articles = {source: process_articles(source, current_articles[source], store) for source in sources}
+        # The Excel file, and the statistics of its index sheet, are only loaded and saved when there are new articles
+        if any(new_articles.values()) or not os.path.exists(Up_To_Date_NEWS_FILE):
+            history_titles = (store.recent_titles(NEAR_DUPLICATE_HISTORY_DAYS)
+                              if GROUP_NEAR_DUPLICATES and NEAR_DUPLICATE_HISTORY_DAYS else [])
+            save_workbook(new_articles, current_date, fetch_stats(current_articles, new_articles), history_titles)
+
+        # Mark the new articles as seen once the workbook with them is saved
+        for source, articles in new_articles.items():
+            if articles:
+                store.add_articles(source, [(article.title, article.canonical_link, article.date, article.link)
+                                            for article in articles])
+
+        # Export the new articles. A failing export sink is logged and skipped by export_articles.
+        for source, articles in new_articles.items():
+            if articles:
+                export_articles(export_sinks, source, [article[:3] for article in articles])
+    except Exception:
+        # The pages of a run whose articles were not saved are fetched and parsed again by the next run
+        discard_all_page_state()
+        raise
+    finally:
+        store.close()
+    # Remember the state of the pages only after all of their articles have been saved
+    commit_page_state()
+    return current_articles
 
-    # Fetch news from each source and save new articles
-    past_articles = load_past_articles()
-    daily_updates_articles = []
 
-    for source in SOURCES:
-        daily_updates_articles.extend(process_articles(source, past_articles))
+def main():
+    """
+    Main function that fetches news from each source, saves new articles, and updates the Excel file.
+    """
+    run(SOURCES)
 
-    save_past_articles(past_articles)
-    # Save the daily updates articles to the daily updates sheet
-    daily_updates_articles = [(author.replace('-', ' '), title, link) for author, title, link in daily_updates_articles]
-    logging.debug(f"Successfully fetched {len(daily_updates_articles)} articles dated {current_date}.")
-    save_articles(daily_updates_articles, f"Daily-Updates-{current_date}")
-    create_index_sheet()
+
+def rebuild_workbook():
+    """
+    Rebuild the Excel file from the article store, e.g. when it is corrupted.
+
+    Only the articles still in the store are restored, those dated before the retention window were evicted.
+    """
+    from workbook_export import export_workbook
+
+    if SHARDED_OUTPUT:
+        raise ValueError("The Excel file can only be rebuilt when SHARDED_OUTPUT is False.")
+    store = create_article_store()
+    try:
+        export_workbook(store, SOURCES)
+    finally:
+        store.close()
+
+
+def run_daemon():
+    """
+    Keep running and poll every source on its own interval, adapted to the publishing cadence of its author.
+
+    The HTTP session and its pooled connections are kept alive between the polls.
+    """
+    scheduler = PollScheduler(SOURCES)
+    while True:
+        due_sources = scheduler.due_sources()
+        if due_sources:
+            logging.info(f"Polling {len(due_sources)} sources.")
+            try:
+                current_articles = run(due_sources)
+            except Exception as e:
+                logging.exception(f"An unexpected error occurred: {e}")
+                current_articles = {}
+            for source in due_sources:
+                scheduler.update(source, current_articles.get(source))
+        time.sleep(max(1, scheduler.seconds_until_next_poll()))
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect the new articles of the news sources into the Excel file.")
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running and poll every source on an interval adapted to its publishing cadence")
+    parser.add_argument('--rebuild-workbook', action='store_true',
+                        help="rebuild the Excel file from the article store, e.g. when it is corrupted; only the "
+                             "articles within ARTICLE_RETENTION_DAYS are restored")
+    args = parser.parse_args()
     try:
-        main()
+        if args.rebuild_workbook:
+            rebuild_workbook()
+        elif args.daemon:
+            run_daemon()
+        else:
+            main()
     except Exception as e:
         logging.exception(f"An unexpected error occurred: {e}")
@@ -0,0 +1,209 @@
+import logging
+
+import numpy as np
+
+from config import NEAR_DUPLICATE_SIMILARITY
+
+# The signature of a title is made of MINHASH_PERMUTATIONS minimum hashes, split into LSH_BANDS bands. Two titles are
+# compared only if all the hashes of one of their bands are equal, which happens for most pairs of titles sharing
+# more than about (1 / LSH_BANDS) ** (LSH_BANDS / MINHASH_PERMUTATIONS) of their trigrams (half of them by default).
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# The titles are compared in chunks of this many titles, to bound the memory of the hash matrices
+SIGNATURE_CHUNK_SIZE = 2000
+
+# The titles of a bucket are compared pairwise up to this size, and only with the first title of the bucket above it
+MAX_PAIRWISE_BUCKET = 50
+
+ASCII_FOLDING = {'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u', 'â': 'a', 'î': 'i', 'û': 'u'}
+
+
+def build_normalization_table(size=0x3000):
+    """
+    Build the table normalizing the lowercased characters of the titles, indexed by their code points: the Turkish
+    letters are folded to ASCII, and the characters that are not letters or digits become spaces.
+
+    Args:
+        size (int): The number of code points of the table. The characters after them are kept as they are.
+
+    Returns:
+        numpy.ndarray: The uint64 normalized code points.
+    """
+    table = np.arange(size, dtype=np.uint64)
+    for code_point in range(1, size):
+        character = chr(code_point)
+        if character in ASCII_FOLDING:
+            table[code_point] = ord(ASCII_FOLDING[character])
+        elif not character.isalnum():
+            table[code_point] = ord(' ')
+    return table
+
+
+NORMALIZATION_TABLE = build_normalization_table()
+
+
+def mix64(values):
+    """
+    Hash 64-bit integers with the SplitMix64 finalizer.
+
+    Args:
+        values (numpy.ndarray): The uint64 values.
+
+    Returns:
+        numpy.ndarray: The uint64 hashes.
+    """
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def trigram_hashes(titles):
+    """
+    Hash the character trigrams of the normalized titles, all the titles at once.
+
+    The titles are normalized for comparison: Turkish aware lowercasing, folding of the Turkish letters to ASCII, and
+    removal of the punctuation.
+
+    Args:
+        titles (list): The titles.
+
+    Returns:
+        tuple: The uint64 hashes of the trigrams, and the index of the title of every trigram, in the order of the
+        titles.
+    """
+    # The titles are joined with NUL characters, so a trigram containing one crosses two titles
+    text = '\0'.join(f" {title} " for title in titles).replace('İ', 'i').replace('I', 'ı').lower()
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    in_table = codes < len(NORMALIZATION_TABLE)
+    codes[in_table] = NORMALIZATION_TABLE[codes[in_table]]
+    # Keep a single space between the words
+    spaces = codes == ord(' ')
+    codes = codes[~(spaces & np.r_[False, spaces[:-1]])]
+
+    title_ids = np.cumsum(codes == 0)[:-2]
+    trigrams = (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+    valid = (codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0)
+    return mix64(trigrams[valid]), title_ids[valid]
+
+
+def minhash_signatures(titles, permutations=MINHASH_PERMUTATIONS):
+    """
+    Compute the MinHash signatures of the character trigrams of titles.
+
+    Args:
+        titles (list): The titles.
+        permutations (int): The number of hashes of a signature.
+
+    Returns:
+        numpy.ndarray: A (titles, permutations) uint32 array of the signatures. The signatures of the titles without
+        any trigram are all 0xFFFFFFFF.
+    """
+    # Multiply-shift hashing with random odd multipliers stands for the permutations
+    multipliers = mix64(np.arange(1, permutations + 1, dtype=np.uint64))[:, None] | np.uint64(1)
+    increments = mix64(np.arange(permutations + 1, 2 * permutations + 1, dtype=np.uint64))[:, None]
+    signatures = np.full((len(titles), permutations), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, len(titles), SIGNATURE_CHUNK_SIZE):
+        hashes, title_ids = trigram_hashes(titles[start:start + SIGNATURE_CHUNK_SIZE])
+        if not len(hashes):
+            continue
+        # One row per permutation, keeping the high 32 bits of the hashes
+        permuted = np.multiply(multipliers, hashes[None, :])
+        permuted += increments
+        permuted >>= np.uint64(32)
+        # The trigrams are ordered by title, so the minimum of every title is reduced over its run of columns
+        starts = np.flatnonzero(np.r_[True, title_ids[1:] != title_ids[:-1]])
+        signatures[start + title_ids[starts]] = np.minimum.reduceat(permuted, starts, axis=1).T
+    return signatures
+
+
+def cluster_titles(titles, similarity=NEAR_DUPLICATE_SIMILARITY, bands=LSH_BANDS):
+    """
+    Cluster the near-duplicate titles with MinHash signatures and LSH banding.
+
+    Only the titles that share a band bucket are compared, so the cost grows with the number of titles and not with
+    the number of pairs of titles.
+
+    Args:
+        titles (list): The titles.
+        similarity (float): The minimum estimated Jaccard similarity of the trigrams of two near-duplicate titles.
+        bands (int): The number of LSH bands, which must divide the number of hashes of a signature.
+
+    Returns:
+        numpy.ndarray: The cluster of every title, as the index of the first title of its cluster.
+    """
+    signatures = minhash_signatures(titles)
+    parents = np.arange(len(titles))
+    if len(titles) < 2:
+        return parents
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def union_if_similar(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j and np.mean(signatures[i] == signatures[j]) >= similarity:
+            parents[max(root_i, root_j)] = min(root_i, root_j)
+
+    has_trigrams = signatures[:, 0] != np.iinfo(np.uint32).max
+    rows = signatures.shape[1] // bands
+    for band in range(bands):
+        # Hash the rows of the band into a single bucket key per title
+        keys = np.zeros(len(titles), dtype=np.uint64)
+        for column in range(band * rows, (band + 1) * rows):
+            keys = mix64(keys ^ signatures[:, column].astype(np.uint64))
+        order = np.argsort(keys, kind='stable')
+        order = order[has_trigrams[order]]
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1], True])
+        sizes = np.diff(boundaries)
+        for start, size in zip(boundaries[:-1][sizes > 1], sizes[sizes > 1]):
+            bucket = order[start:start + size]
+            if size <= MAX_PAIRWISE_BUCKET:
+                for a in range(size):
+                    for b in range(a + 1, size):
+                        union_if_similar(bucket[a], bucket[b])
+            else:
+                for member in bucket[1:]:
+                    union_if_similar(bucket[0], member)
+
+    return np.array([find(i) for i in range(len(titles))])
+
+
+def group_near_duplicates(articles, title_index=1, history_titles=()):
+    """
+    Reorder articles so the articles with near-duplicate titles follow each other.
+
+    Every group takes the place of its first article, and the articles of a group keep their order. The titles of
+    earlier articles are clustered with the new ones, so two new articles that are both near-duplicates of the same
+    earlier title are grouped, and the new articles of stories that were already covered are counted.
+
+    Args:
+        articles (list): The article tuples.
+        title_index (int): The index of the title in the article tuples.
+        history_titles (list): The titles of earlier articles, e.g. from the article store.
+
+    Returns:
+        list: The reordered articles.
+    """
+    if not articles or (len(articles) < 2 and not history_titles):
+        return list(articles)
+    # The new titles come first, so the cluster of a new article is named after its first new article
+    clusters = cluster_titles([article[title_index] for article in articles] + list(history_titles))
+    history_clusters = set(clusters[len(articles):].tolist())
+    groups = {}
+    for article, cluster in zip(articles, clusters):
+        groups.setdefault(cluster, []).append(article)
+    grouped = [group for group in groups.values() if len(group) > 1]
+    if grouped:
+        logging.info(f"Grouped {sum(len(group) for group in grouped)} articles into {len(grouped)} stories covered by "
+                     f"several authors.")
+    repeated = sum(len(group) for cluster, group in groups.items() if cluster in history_clusters)
+    if repeated:
+        logging.info(f"{repeated} new articles cover stories that were already covered by earlier articles.")
+    return [article for group in groups.values() for article in group]
@@ -1,47 +1,27 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
+import codecs
+import re
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import logging
-from datetime import datetime
-from config import SOURCE_MAP
+import os
+import socket
+import threading
+import time
+from config import (SOURCE_MAP, MAX_WORKERS, MAX_CONNECTIONS_PER_HOST, CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES,
+                    REQUEST_DEADLINE, RETRY_BACKOFF, HTML_PARSER, FINGERPRINT_PAGES, PARSE_WORKERS, STREAMING_PARSERS,
+                    STREAM_CHUNK_SIZE, STREAM_TAIL_BYTES)
+from canonical_url import canonicalize_url
+from circuit_breaker import CircuitBreaker
+from fingerprint import FingerprintStore, fingerprint_page
+from http_cache import create_http_cache
+from turkish_dates import article_date
 import random
 
 
-def convert_turkish_date_to_datetime(date_string):
-    """
-    Convert a Turkish date string to a datetime object.
-
-    Parameters:
-    date_string (str): The Turkish date string to convert.
-
-    Returns:
-    str: The converted date string in the format 'dd-mm-yy'.
-    """
-    # Map of Turkish month names and abbreviations to English
-    turkish_to_numeric_months = {
-        'Ocak': '01', 'Oca': '01',
-        'Şubat': '02', 'Şub': '02',
-        'Mart': '03', 'Mar': '03',
-        'Nisan': '04', 'Nis': '04',
-        'Mayıs': '05', 'May': '05',
-        'Haziran': '06', 'Haz': '06',
-        'Temmuz': '07', 'Tem': '07',
-        'Ağustos': '08', 'Ağu': '08',
-        'Eylül': '09', 'Eyl': '09',
-        'Ekim': '10', 'Eki': '10',
-        'Kasım': '11', 'Kas': '11',
-        'Aralık': '12', 'Ara': '12'
-    }
-    # Split the date string into day, month, and year
-    day, month, year = date_string.split()
-    # Convert the Turkish month name or abbreviation to Numeric
-    month = turkish_to_numeric_months[month]
-    # Ensure the day is two digits
-    day = day.zfill(2)
-    # Combine the day, month, and year into a new date string
-    return f"{day}-{month}-{year[2:]}"
-
-
 user_agents = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3',
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:61.0) Gecko/20100101 Firefox/61.0',
@@ -55,26 +35,289 @@ session.headers.update({
     'User-Agent': random.choice(user_agents),
     'Accept-Language': 'tr-TR,tr;q=0.9'
 })
+# Keep a connection pool for every host, large enough for the concurrent requests sent to it
+hosts = {urlparse(entry["url"]).netloc for entry in SOURCE_MAP.values()}
+adapter = HTTPAdapter(pool_connections=len(hosts), pool_maxsize=MAX_CONNECTIONS_PER_HOST)
+session.mount('http://', adapter)
+session.mount('https://', adapter)
 
+host_semaphores = {}
+host_semaphores_lock = threading.Lock()
 
-def get_soup(url):
+
+def get_host_semaphore(url):
     """
-    Send a GET request to a URL and return a BeautifulSoup object of the HTML content.
+    Get the semaphore limiting the number of simultaneous requests to the host of a URL.
+
+    Parameters:
+    url (str): The URL that is going to be requested.
+
+    Returns:
+    threading.BoundedSemaphore: The semaphore of the host of the URL.
+    """
+    host = urlparse(url).netloc
+    with host_semaphores_lock:
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST)
+        return host_semaphores[host]
+
+
+http_cache = create_http_cache()
+fingerprints = FingerprintStore() if FINGERPRINT_PAGES else None
+circuit_breaker = CircuitBreaker()
+
+# Returned by get_page when the page has not been modified since the last run
+NOT_MODIFIED = object()
+
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+# An article as returned by fetch_news. The link is kept as found on the page for display, and the canonical link
+# identifies the article in the article store.
+Article = namedtuple('Article', ['title', 'link', 'date', 'canonical_link'])
+
+
+@lru_cache(maxsize=None)
+def get_html_parser():
+    """
+    Get the HTML parser selected in the configuration, or 'html.parser' if it is not installed.
+
+    Returns:
+    str: The name of the HTML parser to be used by BeautifulSoup.
+    """
+    from bs4 import BeautifulSoup, FeatureNotFound
+
+    try:
+        BeautifulSoup('', HTML_PARSER)
+        return HTML_PARSER
+    except FeatureNotFound:
+        logging.warning(f"The HTML parser '{HTML_PARSER}' is not installed, using 'html.parser' instead.")
+        return 'html.parser'
+
+
+def is_retryable(error):
+    """
+    Check if a failed request is worth retrying.
+
+    Parameters:
+    error (requests.RequestException): The error raised by the request.
+
+    Returns:
+    bool: True for timeouts, connection errors and '429' or '5xx' responses, False otherwise.
+    """
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return False
+
+
+def get_page(url, source=None, stream=False, deadline=None):
+    """
+    Send a GET request to a URL and return the response.
+
+    The request times out after CONNECT_TIMEOUT / READ_TIMEOUT seconds and is retried up to MAX_RETRIES times with a
+    jittered exponential backoff, as long as the deadline is not reached. If the HTTP cache is enabled, the request is
+    conditional and NOT_MODIFIED is returned when the website answers with '304 Not Modified'.
 
     Parameters:
     url (str): The URL to send the GET request to.
+    source (str): The name of the news source, used for the cache statistics.
+    stream (bool): If True, the content is not downloaded yet, and the caller must read it and close the response.
+    deadline (float): The time.monotonic() time after which the request is not retried anymore.
+
+    Returns:
+    requests.Response: The response, None if the request failed, or NOT_MODIFIED.
+    """
+    headers = http_cache.conditional_headers(url) if http_cache is not None else {}
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = session.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=stream)
+            if response.status_code == 304:
+                if http_cache is not None:
+                    http_cache.record(source or url, hit=True)
+                response.close()
+                return NOT_MODIFIED
+            response.raise_for_status()
+            break
+        except requests.RequestException as e:
+            if e.response is not None:
+                e.response.close()
+            if attempt == MAX_RETRIES or not is_retryable(e):
+                logging.error(f"Failed to fetch news: {e}")
+                return None
+            delay = random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                logging.error(f"Failed to fetch news: {e}. No time is left to retry {url}.")
+                return None
+            logging.warning(f"Failed to fetch {url}: {e}. Retrying in {delay:.1f} seconds.")
+            time.sleep(delay)
+
+    if http_cache is not None:
+        http_cache.record(source or url, hit=False)
+        http_cache.store(url, response)
+    return response
+
+
+def seen_links_pattern(links):
+    """
+    Build a pattern matching any of the given links in the HTML of a page.
+
+    Only the path of a link is matched, since the pages often use relative links.
+
+    Parameters:
+    links (iterable): The links of the articles that were already seen.
+
+    Returns:
+    re.Pattern: The compiled pattern, or None if there are no links to match.
+    """
+    paths = {urlparse(link).path for link in links} - {'', '/'}
+    if not paths:
+        return None
+    # The longest paths come first, and a path must end where the attribute value ends, so '/yazi-1' does not match
+    # '/yazi-10'. Canonical links have no trailing slash, while the page may have one.
+    alternatives = b'|'.join(re.escape(path.encode('utf-8')) for path in sorted(paths, key=len, reverse=True))
+    return re.compile(b'(?:' + alternatives + b')/?(?=["\'?#])')
+
+
+def abort_response(response):
+    """
+    Shut down the connection of a streamed response, so that a read blocked in another thread fails.
+
+    Closing the response is not enough, since it waits for the blocked read to finish.
+
+    Parameters:
+    response (requests.Response): The streamed response.
 
     Returns:
-    BeautifulSoup: A BeautifulSoup object of the HTML content of the response.
+    None
     """
     try:
-        response = session.get(url)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logging.error(f"Failed to fetch news: {e}")
+        # The socket object is only borrowed to shut the connection down, the response still closes the socket
+        sock = socket.socket(fileno=response.raw.fileno())
+    except (OSError, ValueError):
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        sock.detach()
+
+
+def read_until_seen(response, pattern, deadline=None):
+    """
+    Read the content of a streamed response until a seen link, and close the response.
+
+    A chunk is only returned once it is full, so a website that keeps sending a few bytes at a time could block a
+    single read for a long time. The connection is therefore shut down by a timer when the deadline is reached, which
+    makes the read fail.
+
+    Parameters:
+    response (requests.Response): The streamed response.
+    pattern (re.Pattern): The pattern matching the seen links, or None to read the whole page.
+    deadline (float): The time.monotonic() time by which the content must be read.
+
+    Returns:
+    tuple: The content read, and True if the download was stopped before the end of the page.
+
+    Raises:
+    requests.Timeout: If the deadline is reached before the content is read.
+    """
+    content = bytearray()
+    stop_at = None
+    timer = None
+    if deadline is not None:
+        timer = threading.Timer(max(0.0, deadline - time.monotonic()), abort_response, (response,))
+        timer.daemon = True
+        timer.start()
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            content += chunk
+            if pattern is not None and stop_at is None:
+                # Search a little before the new chunk as well, in case a link is split between two chunks
+                match = pattern.search(content, max(0, len(content) - len(chunk) - 1024))
+                if match:
+                    stop_at = match.end() + STREAM_TAIL_BYTES
+            if stop_at is not None and len(content) >= stop_at:
+                return bytes(content), True
+    except Exception as e:
+        if deadline is not None and time.monotonic() >= deadline:
+            raise requests.Timeout(f"Reading {response.url} took more than {REQUEST_DEADLINE} seconds.") from e
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+        response.close()
+    # A connection shut down by the timer can also end the content early instead of failing the read
+    if deadline is not None and time.monotonic() >= deadline:
+        raise requests.Timeout(f"Reading {response.url} took more than {REQUEST_DEADLINE} seconds.")
+    return bytes(content), False
+
+
+def get_encoding(content, headers):
+    """
+    Get the character encoding of a page from its 'Content-Type' header or its meta charset tag.
+
+    Parameters:
+    content (bytes): The content of the page.
+    headers (dict): The headers of the response.
+
+    Returns:
+    str: The name of the encoding, or None if the page does not declare a known encoding.
+    """
+    encoding = requests.utils.get_encoding_from_headers({'content-type': headers.get('Content-Type', '')})
+    # requests falls back to ISO-8859-1 for text responses without a charset, which is not a declaration
+    if encoding is None or 'charset' not in headers.get('Content-Type', '').lower():
+        match = META_CHARSET_PATTERN.search(content[:4096])
+        encoding = match.group(1).decode('ascii') if match else None
+    if encoding is None:
+        return None
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
         return None
 
-    return BeautifulSoup(response.content, 'html.parser')
+
+def make_soup(content, encoding=None, parse_only=None, html_parser=None):
+    """
+    Build a BeautifulSoup object from the content of a page.
+
+    Passing the declared encoding skips the slow encoding detection of BeautifulSoup.
+
+    Parameters:
+    content (bytes): The content of the page.
+    encoding (str): The character encoding of the page, if it is known.
+    parse_only (SoupStrainer): If given, only the elements matching it (and their contents) are added to the tree.
+    html_parser (str): The HTML parser to use, by default the one selected in the configuration.
+
+    Returns:
+    BeautifulSoup: A BeautifulSoup object of the HTML content.
+    """
+    # BeautifulSoup is imported with the first page to parse, since a run whose pages have not changed parses none
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, html_parser or get_html_parser(), from_encoding=encoding, parse_only=parse_only)
+
+
+def has_class(*class_names):
+    """
+    Build a class matcher for a parse scope.
+
+    While the page is being parsed, the class attribute is not split into separate classes yet, so a SoupStrainer
+    with class_='col-12' would not match class="col-12 col-md-6" the way find_all does afterwards.
+
+    Parameters:
+    class_names (str): The class names, any of which the element must have.
+
+    Returns:
+    function: A function matching the class attribute of an element.
+    """
+    def match(value):
+        if value is None:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return any(class_name in classes for class_name in class_names)
+    return match
 
 
 # Parser functions for each news site
@@ -97,19 +340,11 @@ def parse_hurriyet(soup):
         if title_tag and date_tag and link_tag:
             title = title_tag.text
             link = "https://www.hurriyet.com.tr" + link_tag
-            date_string = date_tag.text
-            # Split the date string by space and remove the time part if it exists
-            date_parts = date_string.split()
-            if len(date_parts) > 3:  # If the date string contains a time part
-                date_without_time = " ".join(date_parts[:-1])
-            else:
-                date_without_time = date_string
             try:
-                # Convert the Turkish date to a datetime object
-                date = convert_turkish_date_to_datetime(date_without_time)
+                date = article_date(date_tag.text)
                 articles.append((title, link, date))
             except ValueError:
-                logging.error(f"Failed to parse date: '{date_without_time}'")
+                logging.error(f"Failed to parse date: '{date_tag.text}'")
     return articles
 
 
@@ -132,8 +367,7 @@ def parse_sabah(soup):
         if title_tag and link_tag and date_tag:
             title = title_tag.text
             link = "https://www.sabah.com.tr" + link_tag['href']
-            date_string = date_tag.text.split()[:-1]  # Exclude the day of the week
-            date = convert_turkish_date_to_datetime(" ".join(date_string))
+            date = article_date(date_tag.text)
             articles.append((title, link, date))
     return articles
 
@@ -157,7 +391,7 @@ def parse_sozcu(soup):
         if title_tag and date_tag and link_tag:
             title = title_tag.text
             link = link_tag
-            date = convert_turkish_date_to_datetime(date_tag.text)
+            date = article_date(date_tag.text)
             articles.append((title, link, date))
     return articles
 
@@ -180,7 +414,7 @@ def parse_ekonomim(soup):
         if title_tag and date_tag:
             title = title_tag.text
             link = title_tag['href']
-            date = convert_turkish_date_to_datetime(date_tag.text)
+            date = article_date(date_tag.text)
             articles.append((title, link, date))
     return articles
 
@@ -202,8 +436,7 @@ def parse_10haber(soup):
         date_and_title = news_item.text.split(' - ', 1)
         if len(date_and_title) == 2:
             date_string, title = date_and_title
-            # Convert the Turkish date string to a datetime object
-            date = convert_turkish_date_to_datetime(date_string)
+            date = article_date(date_string)
             # Get the link
             link = news_item.find('a')['href']
             articles.append((title, link, date))
@@ -229,8 +462,7 @@ def parse_gazeteoksijen(soup):
         if title_tag and link_tag and date_tag:
             title = title_tag.text.strip()
             link = link_tag['href']
-            date_string = date_tag.text
-            date = convert_turkish_date_to_datetime(date_string)
+            date = article_date(date_tag.text)
             articles.append((title, link, date))
 
     return articles
@@ -255,12 +487,8 @@ def parse_mahfiegilmez(soup):
         link_tag = top_news_item.find('a', class_='timestamp-link')
         if title_tag and date_tag and link_tag:
             title = title_tag.text.strip()
-            date = date_tag.text.strip("")
+            date = article_date(date_tag.text)
             link = link_tag['href']
-            # Adjust the date format and convert it to 'dd-mm-yyyy' format
-            date_parts = date.replace(",", "").split()
-            date = f"{date_parts[1]} {date_parts[0]} {date_parts[2]}"
-            date = convert_turkish_date_to_datetime(date)
             articles.append((title, link, date))
 
     # Parse the rest of the news
@@ -271,12 +499,8 @@ def parse_mahfiegilmez(soup):
         link_tag = news_item.find('a', class_='timestamp-link')
         if title_tag and date_tag and link_tag:
             title = title_tag.text.strip()
-            date = date_tag.text.strip()
+            date = article_date(date_tag.text)
             link = link_tag['href']
-            # Adjust the date format and convert it to 'dd-mm-yyyy' format
-            date_parts = date.replace(",", "").split()
-            date = f"{date_parts[1]} {date_parts[0]} {date_parts[2]}"
-            date = convert_turkish_date_to_datetime(date)
             articles.append((title, link, date))
     return articles
 
@@ -302,16 +526,9 @@ def parse_haberturk(soup):
         if title_element and link_element and date_element:
             title = title_element.text.strip()
             link = 'https://www.haberturk.com' + link_element['href']
-            date_str = date_element.text.strip().replace('Güncelleme: ', '')
+            date = article_date(date_element.text)  # e.g. 'Güncelleme: 2024-10-12 14:30:00'
 
-            # Remove leading and trailing spaces
-            date_str = date_str.strip()
-
-            # Parse the date string and reformat it
-            date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-            formatted_date = date.strftime('%d-%m-%y')
-
-            articles.append((title, link, formatted_date))
+            articles.append((title, link, date))
 
     return articles
 
@@ -334,13 +551,12 @@ def parse_yetkinreport(soup):
         if title_and_link_tag:
             title = title_and_link_tag.text.strip()  # Extract the title from the text of the a tag
             link = title_and_link_tag['href']  # Extract the link from the href attribute of the a tag
-            # Parse the URL and extract the date
-            url_parts = urlparse(link)
-            path_parts = url_parts.path.strip("/").split("/")
-            if len(path_parts) >= 3:
-                year, month, day = path_parts[:3]
-                date = f"{day}-{month}-{year[2:]}"
-                articles.append((title, link, date))
+            # Extract the date from the '/yyyy/mm/dd/' path of the URL
+            try:
+                date = article_date(urlparse(link).path)
+            except ValueError:
+                continue
+            articles.append((title, link, date))
     return articles
 
 
@@ -364,12 +580,9 @@ def parse_perspektif(soup):
         if title_tag and link_tag and date_tag:
             title = title_tag['content']
             link = link_tag['content']
-            date_str = date_tag['content']
+            date = article_date(date_tag['content'])
 
-            # Parse the date string and reformat it
-            formatted_date = convert_turkish_date_to_datetime(date_str)
-
-            articles.append((title, link, formatted_date))
+            articles.append((title, link, date))
 
     return articles
 
@@ -394,7 +607,7 @@ def parse_paraanaliz(soup):
             if title_tag and date_tag:
                 title = title_tag.text
                 link = title_tag['href']
-                date = convert_turkish_date_to_datetime(date_tag.text)
+                date = article_date(date_tag.text)
                 articles.append((title, link, date))
     return articles
 
@@ -417,8 +630,7 @@ def parse_ugurses(soup):
     if title_tag and link_tag and date_tag:
         title = title_tag.text
         link = link_tag['href']
-        date = datetime.strptime(date_tag['datetime'].split('T')[0], '%Y-%m-%d')
-        date = date.strftime('%d-%m-%y')  # format the date as 'dd-mm-yy'
+        date = article_date(date_tag['datetime'])
         articles.append((title, link, date))
     return articles
 
@@ -452,15 +664,9 @@ def parse_yenisafak(soup):
             title = h2.text.strip()
             link = "https://www.yenisafak.com" + item.find('a')['href']
             date = item.find('p', class_='date').text.strip()
-            # Split the date string into its components
-            components = date.split()
-            # Remove the comma from the year
-            components[2] = components[2].replace(',', '')
-            # Reorder the components and join them back into a string
-            date = ' '.join([components[1], components[0], components[2]])
             try:
-                date = convert_turkish_date_to_datetime(date)  # format the date as 'dd-mm-yy'
-            except KeyError as e:
+                date = article_date(date)  # format the date as 'dd-mm-yy'
+            except ValueError as e:
                 logging.error(f"Failed to convert date: {date}. Error: {e}")
                 continue
             articles.append((title, link, date))
@@ -491,8 +697,7 @@ def parse_birgun(soup):
         if title_tag and date_tag:
             title = title_tag.text
             link = "https://www.birgun.net" + title_tag['href']
-            date = datetime.strptime(date_tag.text, '%d.%m.%Y %H:%M')
-            date = date.strftime('%d-%m-%y')  # format the date as 'dd-mm-yy'
+            date = article_date(date_tag.text)  # format the date as 'dd-mm-yy'
             articles.append((title, link, date))
     return articles
 
@@ -513,10 +718,7 @@ def parse_gazeteduvar(soup):
         date_tag = item.find('span', class_='time')
         link_tag = item.find('a')
         if date_tag and link_tag:
-            date = date_tag.text.replace(',', '').strip()  # remove commas and leading/trailing whitespaces
-            date = date.split(' ')[1:]  # remove the day of the week
-            date = ' '.join(date)  # join the remaining parts
-            date = convert_turkish_date_to_datetime(date)  # convert the date to 'dd-mm-yy' format
+            date = article_date(date_tag.text)  # convert the date to 'dd-mm-yy' format
             title = link_tag['title']
             link = link_tag['href']
             articles.append((title, link, date))
@@ -548,8 +750,7 @@ def parse_t24(soup):
         date_tag = item.find('div', class_='_2J9OF col-sm-3 col-xs-12').find_all('p')[-1]
         link_tag = item.find('div', class_='_31Tbh col-sm-9 col-xs-12').find('h3').find('a')
         if date_tag and link_tag:
-            date = date_tag.text.strip()
-            date = convert_turkish_date_to_datetime(date)
+            date = article_date(date_tag.text)
             title = link_tag.text.strip()
             link = "https://t24.com.tr" + link_tag['href']
             articles.append((title, link, date))
@@ -579,26 +780,247 @@ parsers = {
 }
 
 
-def fetch_news(source):
+@lru_cache(maxsize=None)
+def parse_scopes():
+    """
+    Get the parse scopes of the parser functions.
+
+    If a parser function only looks inside some elements of the page, add a SoupStrainer matching them to the below
+    dictionary, so only those elements are added to the tree. A parser function without a parse scope gets the tree of
+    the whole page.
+
+    Returns:
+    dict: A dictionary where the keys are the names of the parser functions and the values are their SoupStrainers.
+    """
+    from bs4 import SoupStrainer
+
+    return {
+        'parse_hurriyet': SoupStrainer('div', class_='highlighted-box mb20'),
+        'parse_sabah': SoupStrainer('div', class_='col-sm-12 view20'),
+        'parse_sozcu': SoupStrainer('div', class_=has_class('col-lg-8')),
+        'parse_ekonomim': SoupStrainer('div', class_='col-12 col-lg mw0 author-article_list'),
+        'parse_10haber': SoupStrainer('p', class_=has_class('card-text')),
+        'parse_gazeteoksijen': SoupStrainer('div', class_='col-12 col-md-6'),
+        'parse_mahfiegilmez': SoupStrainer('article'),
+        'parse_haberturk': SoupStrainer('li', {'class': 'mb-16 pb-8 border-b dark:border-gray-800'}),
+        'parse_yetkinreport': SoupStrainer('div', class_=has_class('kl-blog-item-container')),
+        'parse_perspektif': SoupStrainer('div', class_=has_class('box', 'three', 'small')),
+        'parse_paraanaliz': SoupStrainer('li'),
+        'parse_ugurses': SoupStrainer('article'),
+        'parse_yenisafak': SoupStrainer('div', class_=has_class('left-content')),
+        'parse_birgun': SoupStrainer('div', class_=has_class('col-12')),
+        'parse_gazeteduvar': SoupStrainer('div', class_='col-12 col-md-6'),
+        'parse_t24': SoupStrainer('div', class_='col-md-8 col-sm-12 col-xs-12'),
+    }
+
+
+def fetch_page(source, seen_links=()):
+    """
+    Fetch the author page of a source.
+
+    If the parser function of the source is in STREAMING_PARSERS, the download is stopped shortly after the first
+    seen link. The content is always streamed, so the page fails when it takes more than REQUEST_DEADLINE seconds.
+
+    Parameters:
+    source (str): The name of the news source.
+    seen_links (iterable): The links of the articles of the source that were already seen.
+
+    Returns:
+    tuple: The content and the character encoding of the page, None if the page could not be fetched, or
+    NOT_MODIFIED if the page has not changed since the last run.
+    """
+    url = SOURCE_MAP[source]["url"]
+    parser_name = SOURCE_MAP[source]["parser"]
+    if not circuit_breaker.allow(source):
+        logging.warning(f"Skipping {source} because its circuit is open after repeated failures.")
+        return None
+    pattern = seen_links_pattern(seen_links) if parser_name in STREAMING_PARSERS else None
+    with get_host_semaphore(url):
+        deadline = time.monotonic() + REQUEST_DEADLINE
+        response = get_page(url, source, stream=True, deadline=deadline)
+        if response is not None and response is not NOT_MODIFIED:
+            try:
+                content, truncated = read_until_seen(response, pattern, deadline)
+            except requests.RequestException as e:
+                logging.error(f"Failed to fetch news: {e}")
+                # The validators were stored with the headers, but the page was never read
+                if http_cache is not None:
+                    http_cache.discard(url)
+                response = None
+    if response is None:
+        logging.error("Failed to fetch articles: No internet connection, invalid URL, or other network issue.")
+        circuit_breaker.record_failure(source)
+        return None
+    circuit_breaker.record_success(source)
+    if response is NOT_MODIFIED:
+        logging.debug(f"The page of {source} has not been modified since the last run.")
+        return NOT_MODIFIED
+    if truncated:
+        # Where a streamed download stops depends on the chunks, so a partial page is not fingerprinted
+        logging.debug(f"Stopped the download of {source} after {len(content)} bytes, at the first seen article.")
+    elif fingerprints is not None and fingerprints.is_unchanged(source, fingerprint_page(content, parser_name)):
+        logging.debug(f"The page of {source} has the same fingerprint as in the last run.")
+        return NOT_MODIFIED
+    return content, get_encoding(content, response.headers)
+
+
+def parse_page(parser_name, content, encoding=None, html_parser=None):
+    """
+    Parse the content of a page with a parser function.
+
+    Only plain article tuples are returned, so this can run in a worker process.
+
+    Parameters:
+    parser_name (str): The name of the parser function in the parsers dictionary.
+    content (bytes): The content of the page.
+    encoding (str): The character encoding of the page, if it is known.
+    html_parser (str): The HTML parser to use, by default the one selected in the configuration.
+
+    Returns:
+    list: A list of tuples, where each tuple contains the title, link, and date of an article.
+    """
+    soup = make_soup(content, encoding, parse_scopes().get(parser_name), html_parser)
+    return parsers[parser_name](soup)
+
+
+def fetch_news(source, parse_executor=None, seen_links=()):
     """
     Fetch news from a specific source.
 
     Parameters:
     source (str): The name of the news source to fetch news from.
+    parse_executor (concurrent.futures.ProcessPoolExecutor): If given, the page is parsed in one of its processes.
+    seen_links (iterable): The links of the articles of the source that were already seen.
 
     Returns:
-    list: A list of tuples, where each tuple contains the title, link, and date of an article.
+    list: A list of Article tuples, where each tuple contains the title, link, date, and canonical link of an
+    article, or None if the page has not been modified since the last run.
     """
     if source in SOURCE_MAP:
-        url = SOURCE_MAP[source]["url"]
-        parser = parsers[SOURCE_MAP[source]["parser"]]
-        soup = get_soup(url)
-        if soup is None:
-            logging.error("Failed to fetch articles: No internet connection, invalid URL, or other network issue.")
+        page = fetch_page(source, seen_links)
+        if page is None:
             return []
-        articles = parser(soup)
+        if page is NOT_MODIFIED:
+            return None
+        parser_name = SOURCE_MAP[source]["parser"]
+        if parse_executor is not None:
+            articles = parse_executor.submit(parse_page, parser_name, *page).result()
+        else:
+            articles = parse_page(parser_name, *page)
         logging.debug(f"Fetched {len(articles)} articles from {source}.")
-        return articles
+        return [Article(title, link, date, canonicalize_url(link)) for title, link, date in articles]
     else:
         logging.error(f"Unknown source: {source}")
         return []
+
+
+def start_parse_executor():
+    """
+    Start the pool of processes that parse the pages.
+
+    The processes are forked from the main thread before any fetching thread is started, since a process forked while
+    another thread holds a lock, e.g. of logging or of the HTTP session, can deadlock. A task is submitted to every
+    process and waited for, so that all of them are running before the pool is returned.
+
+    Returns:
+    concurrent.futures.ProcessPoolExecutor: The started pool, or None if PARSE_WORKERS is 0.
+    """
+    if not PARSE_WORKERS:
+        return None
+    parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    for future in [parse_executor.submit(os.getpid) for _ in range(PARSE_WORKERS)]:
+        future.result()
+    return parse_executor
+
+
+def fetch_all_news(sources, seen_links=None):
+    """
+    Fetch news from several sources concurrently.
+
+    The requests are sent from a thread pool of MAX_WORKERS threads, and at most MAX_CONNECTIONS_PER_HOST requests
+    are sent to the same host at a time. If PARSE_WORKERS is set, the pages are parsed in a pool of that many
+    processes, which are started before the fetching threads, otherwise in the fetching threads.
+
+    Parameters:
+    sources (list): The names of the news sources to fetch news from.
+    seen_links (dict): A dictionary where the keys are source names and the values are the links of the articles
+    that were already seen, used to stop streamed downloads early.
+
+    Returns:
+    dict: A dictionary where the keys are source names and the values are lists of tuples, where each tuple contains
+    the title, link, and date of an article, or None if the page of the source has not been modified.
+    """
+    parse_executor = start_parse_executor()
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {source: executor.submit(fetch_news, source, parse_executor, (seen_links or {}).get(source, ()))
+                       for source in sources}
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    news = {}
+    for source, future in futures.items():
+        try:
+            news[source] = future.result()
+        except Exception as e:
+            logging.exception(f"Failed to parse articles from {source}: {e}")
+            news[source] = []
+            discard_page_state(source)
+    circuit_breaker.save()
+    return news
+
+
+def discard_page_state(source):
+    """
+    Forget the HTTP cache validators and the fingerprint of the page of a source fetched in this run.
+
+    This is called when the page could not be parsed, so the next run does not skip it as not modified.
+
+    Parameters:
+    source (str): The name of the news source.
+
+    Returns:
+    None
+    """
+    if http_cache is not None and source in SOURCE_MAP:
+        http_cache.discard(SOURCE_MAP[source]["url"])
+    if fingerprints is not None:
+        fingerprints.discard(source)
+
+
+def discard_all_page_state():
+    """
+    Forget the HTTP cache validators and the fingerprints of all the pages fetched in this run.
+
+    This is called when the articles of the run could not be saved, so that in daemon mode the next run does not
+    commit them and skip those pages as not modified.
+
+    Returns:
+    None
+    """
+    if http_cache is not None:
+        http_cache.discard_pending()
+    if fingerprints is not None:
+        fingerprints.discard_pending()
+
+
+def commit_page_state():
+    """
+    Remember the HTTP cache validators and the fingerprints of the pages fetched in this run.
+
+    This must be called only after all the articles of the run have been saved, otherwise the next run could skip
+    pages whose articles were never saved. The pages that could not be parsed were already discarded by
+    fetch_all_news.
+
+    Returns:
+    None
+    """
+    if http_cache is not None:
+        http_cache.commit()
+        http_cache.log_stats()
+        http_cache.stats.clear()
+    if fingerprints is not None:
+        fingerprints.commit()
+        logging.info(f"{fingerprints.unchanged} pages had the same fingerprint as in the last run.")
+        fingerprints.unchanged = 0
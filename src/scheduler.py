@@ -0,0 +1,95 @@
+import datetime
+import logging
+import time
+
+from config import DAEMON_DEFAULT_INTERVAL, DAEMON_MAX_INTERVAL, DAEMON_MIN_INTERVAL, DAEMON_POLLS_PER_ARTICLE
+
+
+def publishing_gap(dates, today=None):
+    """
+    Estimate the number of days between two articles of an author from the dates of their latest articles.
+
+    If the author has not published for longer than the usual gap, the time since the latest article is used instead,
+    so inactive authors are polled less and less often.
+
+    Args:
+        dates (list): The dates of the articles in the format 'dd-mm-yy'.
+        today (datetime.date): The current date.
+
+    Returns:
+        float: The estimated number of days between two articles, or None if there are not enough dates.
+    """
+    today = today or datetime.date.today()
+    parsed_dates = set()
+    for date in dates:
+        try:
+            parsed_dates.add(datetime.datetime.strptime(date, '%d-%m-%y').date())
+        except (TypeError, ValueError):
+            continue
+    latest_dates = sorted(parsed_dates, reverse=True)[:10]
+    if len(latest_dates) < 2:
+        return None
+    average_gap = (latest_dates[0] - latest_dates[-1]).days / (len(latest_dates) - 1)
+    return max(average_gap, (today - latest_dates[0]).days)
+
+
+class PollScheduler:
+    """
+    Schedule every source on its own polling interval.
+
+    The interval of a source follows the publishing cadence of its author: it is the estimated gap between two
+    articles divided by DAEMON_POLLS_PER_ARTICLE, kept between DAEMON_MIN_INTERVAL and DAEMON_MAX_INTERVAL seconds.
+    """
+
+    def __init__(self, sources):
+        self.intervals = {source: DAEMON_DEFAULT_INTERVAL for source in sources}
+        self.next_polls = {source: 0 for source in sources}
+
+    def due_sources(self, now=None):
+        """
+        Get the sources that are due to be polled.
+
+        Args:
+            now (float): The current time in seconds since the epoch.
+
+        Returns:
+            list: The names of the due sources.
+        """
+        now = now or time.time()
+        return [source for source, next_poll in self.next_polls.items() if next_poll <= now]
+
+    def seconds_until_next_poll(self, now=None):
+        """
+        Get the number of seconds until the next source is due.
+
+        Args:
+            now (float): The current time in seconds since the epoch.
+
+        Returns:
+            float: The number of seconds, 0 if a source is already due.
+        """
+        now = now or time.time()
+        return max(0, min(self.next_polls.values()) - now)
+
+    def update(self, source, articles, now=None):
+        """
+        Adapt the interval of a source to the articles of its latest poll and schedule its next poll.
+
+        Args:
+            source (str): The name of the news source.
+            articles (list): The articles fetched from the source, or None if its page has not changed. If the page
+            has not changed or could not be fetched, the interval is kept.
+            now (float): The current time in seconds since the epoch.
+
+        Returns:
+            None
+        """
+        now = now or time.time()
+        gap = publishing_gap([article[2] for article in articles]) if articles else None
+        if gap is not None:
+            interval = gap * 24 * 60 * 60 / DAEMON_POLLS_PER_ARTICLE
+            interval = max(DAEMON_MIN_INTERVAL, min(DAEMON_MAX_INTERVAL, interval))
+            if interval != self.intervals[source]:
+                logging.info(f"Polling {source} every {interval / 60:.0f} minutes.")
+            self.intervals[source] = interval
+        self.next_polls[source] = now + self.intervals[source]
@@ -0,0 +1,199 @@
+import hashlib
+
+import numpy as np
+
+
+def link_key(source, link):
+    """
+    Compute the 64-bit key of an article from its source and link.
+
+    Args:
+        source (str): The name of the news source.
+        link (str): The link of the article.
+
+    Returns:
+        int: The 64-bit hash of the source and the link.
+    """
+    return int.from_bytes(hashlib.blake2b(f"{source}|{link}".encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class BloomFilter:
+    """
+    Bloom filter over 64-bit keys, answering most lookups of new articles without searching the keys.
+
+    The bit positions of a key are derived from its two 32-bit halves (double hashing), so the keys are not hashed
+    again.
+    """
+
+    def __init__(self, bits, hashes):
+        self.bits = bits
+        # Single bytes of a bytes object are read much faster than the items of a NumPy array
+        self.lookup_bits = bits.tobytes()
+        self.size = len(bits) * 8
+        self.hashes = hashes
+
+    @classmethod
+    def from_keys(cls, keys, bits_per_key):
+        """
+        Build a Bloom filter containing the given keys.
+
+        Args:
+            keys (numpy.ndarray): The 64-bit keys.
+            bits_per_key (int): The number of bits of the filter per key. 10 bits give about 1% of false positives.
+
+        Returns:
+            BloomFilter: The Bloom filter.
+        """
+        size = max(64, (len(keys) * bits_per_key + 7) // 8 * 8)
+        hashes = max(1, round(bits_per_key * 0.693))
+        keys = np.asarray(keys, dtype=np.uint64)
+        low, high = keys & np.uint64(0xFFFFFFFF), keys >> np.uint64(32)
+        positions = np.zeros(size, dtype=bool)
+        for i in range(hashes):
+            positions[(low + np.uint64(i) * high) % np.uint64(size)] = True
+        return cls(np.packbits(positions, bitorder='little'), hashes)
+
+    def might_contain(self, key):
+        """
+        Check if a key might be in the filter.
+
+        Args:
+            key (int): The 64-bit key.
+
+        Returns:
+            bool: False if the key is certainly not in the filter, True if it might be.
+        """
+        low, high = key & 0xFFFFFFFF, key >> 32
+        for i in range(self.hashes):
+            position = (low + i * high) % self.size
+            if not self.lookup_bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def save(self, path):
+        """
+        Save the Bloom filter to a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            None
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, bits=self.bits, hashes=np.array([self.hashes]))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a Bloom filter from a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            BloomFilter: The Bloom filter.
+        """
+        with np.load(path) as data:
+            return cls(data['bits'], int(data['hashes'][0]))
+
+
+class SeenIndex:
+    """
+    Compact index of the articles seen before.
+
+    Every article is kept as a 64-bit hash of its source and link in a sorted NumPy array: 8 bytes per article instead
+    of a set of string tuples. The array can be memory-mapped from a file, so loading the index does not depend on its
+    size. An optional Bloom filter answers most lookups of new articles without searching the array. The index is
+    immutable: a new index is built with from_keys() to include new articles.
+    """
+
+    def __init__(self, keys=None, bloom=None):
+        self.keys = keys if keys is not None else np.empty(0, dtype=np.uint64)
+        self.bloom = bloom
+
+    @classmethod
+    def from_keys(cls, keys, bloom_bits_per_key=0):
+        """
+        Build an index from article keys.
+
+        Args:
+            keys (iterable): The 64-bit keys of the articles.
+            bloom_bits_per_key (int): The number of Bloom filter bits per key, 0 for no Bloom filter.
+
+        Returns:
+            SeenIndex: The index.
+        """
+        keys = np.unique(np.fromiter(keys, dtype=np.uint64))
+        bloom = BloomFilter.from_keys(keys, bloom_bits_per_key) if bloom_bits_per_key else None
+        return cls(keys, bloom)
+
+    @classmethod
+    def load(cls, keys_path, bloom_path=None):
+        """
+        Load an index from its files. The keys are memory-mapped, not read.
+
+        Args:
+            keys_path (str): The path of the '.npy' file of the sorted keys.
+            bloom_path (str): The path of the Bloom filter file, if there is one.
+
+        Returns:
+            SeenIndex: The index.
+        """
+        keys = np.load(keys_path, mmap_mode='r')
+        bloom = BloomFilter.load(bloom_path) if bloom_path else None
+        return cls(keys, bloom)
+
+    def save(self, keys_path, bloom_path=None):
+        """
+        Save the index to its files.
+
+        Args:
+            keys_path (str): The path of the '.npy' file of the sorted keys.
+            bloom_path (str): The path of the Bloom filter file, if the index has a Bloom filter.
+
+        Returns:
+            None
+        """
+        with open(keys_path, 'wb') as f:
+            np.save(f, self.keys)
+        if bloom_path and self.bloom is not None:
+            self.bloom.save(bloom_path)
+
+    def contains_key(self, key):
+        """
+        Check if an article key is in the index.
+
+        Args:
+            key (int): The 64-bit key of the article.
+
+        Returns:
+            bool: True if the article was seen before.
+        """
+        if self.bloom is not None and not self.bloom.might_contain(key):
+            return False
+        position = int(np.searchsorted(self.keys, np.uint64(key)))
+        return position < len(self.keys) and int(self.keys[position]) == key
+
+    def is_new(self, source, link):
+        """
+        Check if an article of a source has not been seen before.
+
+        Args:
+            source (str): The name of the news source.
+            link (str): The link of the article.
+
+        Returns:
+            bool: True if the article is new.
+        """
+        return not self.contains_key(link_key(source, link))
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes of the keys and the Bloom filter.
+        """
+        return self.keys.nbytes + (self.bloom.bits.nbytes if self.bloom is not None else 0)
@@ -0,0 +1,88 @@
+from copy import copy
+
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.builtins import styles as builtin_styles
+
+
+def article_style(name, font):
+    """
+    Build the named style of the cells of a column of articles.
+
+    Args:
+        name (str): The name of the style.
+        font (openpyxl.styles.Font): The font of the cells.
+
+    Returns:
+        openpyxl.styles.NamedStyle: The named style.
+    """
+    thin = Side(style='thin')
+    return NamedStyle(name=name, font=font, border=Border(left=thin, right=thin, top=thin, bottom=thin),
+                      alignment=Alignment(wrap_text=True, horizontal='center', vertical='center'))
+
+
+# The named styles of the columns of the article rows. They are stored once in the workbook and shared by the cells.
+named_styles = {
+    'Article Title': article_style('Article Title', Font(name='Arial', size=14)),
+    'Article Link': article_style('Article Link', copy(builtin_styles['Hyperlink'].font)),
+    'Article Date': article_style('Article Date', Font(name='Consolas', size=12)),
+    'Daily Author': article_style('Daily Author', Font(name='Times New Roman', size=12, italic=True)),
+    'Daily Title': article_style('Daily Title', Font(name='Arial', size=14, bold=True)),
+}
+
+# The named style of every column of the article rows, by the type of sheet
+column_styles = {
+    'Daily-Updates': ['Daily Author', 'Daily Title', 'Article Link'],
+    'Author': ['Article Title', 'Article Link', 'Article Date'],
+}
+
+
+def register_styles(book):
+    """
+    Add the named styles that the workbook does not have yet.
+
+    Args:
+        book (openpyxl.Workbook): Workbook object.
+
+    Returns:
+        None
+    """
+    for name, style in named_styles.items():
+        if name not in book.named_styles:
+            book.add_named_style(copy(style))
+
+
+def add_zebra_striping(sheet):
+    """
+    Fill every other article row of the sheet with light gray, with a single conditional formatting rule.
+
+    Args:
+        sheet (openpyxl.Worksheet): Sheet object.
+
+    Returns:
+        None
+    """
+    fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+    sheet.conditional_formatting.add('A3:C1048576', FormulaRule(formula=['MOD(ROW(),2)=0'], fill=fill))
+
+
+def format_rows(sheet, source, rows):
+    """
+    Apply the named styles of the columns to article rows of the sheet.
+
+    Args:
+        sheet (openpyxl.Worksheet): Sheet object.
+        source (str): Source string representing the type of articles.
+        rows (range): The numbers of the rows to format.
+
+    Returns:
+        None
+    """
+    register_styles(sheet.parent)
+    if not sheet.conditional_formatting:
+        # The sheets created before the striping rule have it added once
+        add_zebra_striping(sheet)
+    styles = column_styles['Daily-Updates' if source.startswith('Daily-Updates') else 'Author']
+    for row in rows:
+        for (column, style) in enumerate(styles, start=1):
+            sheet.cell(row=row, column=column).style = style
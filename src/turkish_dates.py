@@ -0,0 +1,81 @@
+import datetime
+import re
+from functools import lru_cache
+
+# The Turkish month names, and their abbreviations, which are their first three letters
+TURKISH_MONTHS = ['ocak', 'şubat', 'mart', 'nisan', 'mayıs', 'haziran', 'temmuz', 'ağustos', 'eylül', 'ekim', 'kasım',
+                  'aralık']
+
+months = {}
+for (number, name) in enumerate(TURKISH_MONTHS, start=1):
+    months[name] = months[name[:3]] = number
+
+# Longer names first, so that a full month name is not matched as its abbreviation
+month_pattern = '|'.join(sorted(months, key=len, reverse=True))
+
+#  For a new date format, add its compiled pattern with the names of its groups to the below list. The patterns are
+#  searched in the lowercased date string in order, and the first one that matches is used.
+date_patterns = [
+    # '2024-10-12 14:30:00', '2024-10-12T14:30:00+03:00', or the '2024/10/12' path of a link
+    (re.compile(r'(?P<year>\d{4})[-/](?P<month>\d{1,2})[-/](?P<day>\d{1,2})'), False),
+    # '12.10.2024 14:30'
+    (re.compile(r'(?P<day>\d{1,2})\.(?P<month>\d{1,2})\.(?P<year>\d{4})'), False),
+    # '12 Ekim 2024', '12 Eki 2024 14:30', 'Cumartesi, 12 Ekim 2024', '12 Ekim 2024 Cumartesi'
+    (re.compile(rf'(?P<day>\d{{1,2}})\.?\s+(?P<month>{month_pattern})\.?,?\s+(?P<year>\d{{4}})'), True),
+    # 'Ekim 12, 2024'
+    (re.compile(rf'(?P<month>{month_pattern})\.?\s+(?P<day>\d{{1,2}}),?\s+(?P<year>\d{{4}})'), True),
+]
+
+
+def turkish_lower(text):
+    """
+    Lowercase a Turkish text, where the lowercase of 'I' is 'ı' and the lowercase of 'İ' is 'i'.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The lowercased text.
+    """
+    return text.replace('İ', 'i').replace('I', 'ı').lower()
+
+
+@lru_cache(maxsize=4096)
+def parse_turkish_date(date_string):
+    """
+    Parse a date in one of the formats of the news websites, with Turkish month names or numeric months.
+
+    The same dates repeat many times on a page and between the runs, so the parsed dates are memoized.
+
+    Args:
+        date_string (str): The date string found on the page.
+
+    Returns:
+        datetime.date: The date.
+
+    Raises:
+        ValueError: If the date string does not match any of the formats, or is not a valid date.
+    """
+    text = turkish_lower(date_string)
+    for pattern, has_month_name in date_patterns:
+        match = pattern.search(text)
+        if match:
+            month = months[match['month']] if has_month_name else int(match['month'])
+            return datetime.date(int(match['year']), month, int(match['day']))
+    raise ValueError(f"Unknown date format: '{date_string}'")
+
+
+def article_date(date_string):
+    """
+    Convert a date found on a page to the format of the dates of the articles.
+
+    Args:
+        date_string (str): The date string found on the page.
+
+    Returns:
+        str: The date in the format 'dd-mm-yy'.
+
+    Raises:
+        ValueError: If the date string does not match any of the formats, or is not a valid date.
+    """
+    return parse_turkish_date(date_string).strftime('%d-%m-%y')
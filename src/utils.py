@@ -18,6 +18,28 @@ os.makedirs(DATA_DIR, exist_ok=True)
 logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def split_article_line(line, separator='|'):
+    """
+    Split a 'source|link|date' line of the past articles files.
+
+    The names of the sources and the dates never contain '|', so the line is split at its first and its last '|',
+    which keeps a link that contains '|' whole.
+
+    Args:
+    line (str or bytes): The line, without the line break.
+    separator (str or bytes): The separator, b'|' for a line read as bytes.
+
+    Returns:
+    tuple: The source, link, and date of the article.
+
+    Raises:
+    ValueError: If the line does not have the three fields.
+    """
+    source, rest = line.split(separator, 1)
+    link, date = rest.rsplit(separator, 1)
+    return source, link, date
+
+
 def load_past_articles():
     """
     Load past articles from a file.
@@ -30,22 +52,8 @@ def load_past_articles():
     try:
         with open(PAST_ARTICLES_FILE, 'r') as f:
             for line in f:
-                source, link, date = line.strip().split('|', 2)
+                source, link, date = split_article_line(line.strip())
                 past_articles.setdefault(source, set()).add((link, date))
     except FileNotFoundError:
         pass
     return past_articles
-
-
-def save_past_articles(past_articles):
-    """
-    Save past articles to a file.
-
-    Parameters:
-    past_articles (dict): A dictionary where the keys are source names and the values are sets of tuples. Each tuple
-    contains a link and a date.
-    """
-    with open(PAST_ARTICLES_FILE, 'w') as f:
-        for source, articles in past_articles.items():
-            for link, date in articles:
-                f.write(f"{source}|{link}|{date}\n")
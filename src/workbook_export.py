@@ -0,0 +1,150 @@
+import datetime
+import itertools
+import logging
+import os
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+
+from article_source import append_write_only_headers
+from config import GROUP_NEAR_DUPLICATES, MAX_ARTICLES_PER_SHEET, Up_To_Date_NEWS_FILE
+from excel_sheet import (INDEX_HEADERS, INDEX_WIDTHS, set_column_widths, style_index_cell, style_index_header,
+                         style_index_link)
+from excel_writer import link_column
+from near_duplicates import group_near_duplicates
+from sheet_styles import add_zebra_striping, column_styles, register_styles
+
+
+def write_only_rows(sheet, source, rows):
+    """
+    Stream article rows to a sheet of a write-only workbook, with the formatting of the rows saved by save_articles.
+
+    Args:
+        sheet (openpyxl.worksheet._write_only.WriteOnlyWorksheet): Write-only sheet object.
+        source (str): Source string representing the type of articles.
+        rows (iterable): The values of the rows.
+
+    Returns:
+        int: The number of rows written.
+    """
+    styles = column_styles['Daily-Updates' if source.startswith('Daily-Updates') else 'Author']
+    count = 0
+    for row in rows:
+        cells = []
+        for (column, (value, style)) in enumerate(zip(row, styles), start=1):
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.style = style
+            if column == link_column(source):
+                cell.hyperlink = value
+            cells.append(cell)
+        sheet.append(cells)
+        count += 1
+    return count
+
+
+def write_index_sheet(sheet, source_stats):
+    """
+    Write the index sheet of a write-only workbook, with the layout of create_index_sheet.
+
+    Args:
+        sheet (openpyxl.worksheet._write_only.WriteOnlyWorksheet): Write-only sheet object.
+        source_stats (dict): A dictionary where the keys are the names of the sheets to link to and the values are
+        tuples containing the number of articles and the date of the last article of the source.
+
+    Returns:
+        None
+    """
+    header_cells = []
+    for (column, (header, width)) in zip('ABCD', zip(INDEX_HEADERS, INDEX_WIDTHS)):
+        header_cell = WriteOnlyCell(sheet, value=header)
+        style_index_header(header_cell)
+        header_cells.append(header_cell)
+        sheet.column_dimensions[column].width = width
+    sheet.append(header_cells)
+    for (row, (sheet_name, (count, last_article))) in enumerate(source_stats.items(), start=2):
+        link_cell = WriteOnlyCell(sheet)
+        link_cell.row = row  # The striping depends on the row, which a write-only cell only gets once it is appended
+        style_index_link(link_cell, sheet_name)
+        cells = [link_cell]
+        for value in (count, last_article, None):  # The rebuild does not fetch, so the last fetch is left empty
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.row = row
+            style_index_cell(cell)
+            cells.append(cell)
+        sheet.append(cells)
+
+
+def daily_updates_rows(store, sources, current_date):
+    """
+    Get the rows of the 'Daily-Updates' sheet from the article store.
+
+    The rows are streamed from the store, unless the near-duplicate titles are grouped, which needs all the titles
+    of the day.
+
+    Args:
+        store (SQLiteArticleStore or JournalArticleStore): The article store.
+        sources (list): The names of the news sources.
+        current_date (str): The current date in the format 'dd-mm-yy'.
+
+    Returns:
+        iterable: Tuples containing the author, title, and link of the articles dated today.
+    """
+    rows = ((source.replace('-', ' '), title, link) for source in sources
+            for title, link, date in store.articles(source) if date == current_date)
+    if GROUP_NEAR_DUPLICATES:
+        return group_near_duplicates(list(rows))
+    return rows
+
+
+def export_workbook(store, sources, path=Up_To_Date_NEWS_FILE):
+    """
+    Rebuild the Excel file from the article store.
+
+    The workbook is written in openpyxl's write-only mode: the rows of every sheet are streamed from the store to the
+    file, so the memory used does not grow with the number of articles, apart from the hyperlinks of the links, which
+    openpyxl keeps until the end of their sheet. The layout is the one of the Excel file
+    updated by the runs: the 'Daily-Updates' sheet first, the index sheet, and a sheet per source with its latest
+    MAX_ARTICLES_PER_SHEET articles. It also recovers a corrupted Excel file.
+
+    Args:
+        store (SQLiteArticleStore or JournalArticleStore): The article store.
+        sources (list): The names of the news sources.
+        path (str): The path of the Excel file.
+
+    Returns:
+        None
+    """
+    current_date = datetime.datetime.now().strftime("%d-%m-%y")
+    book = openpyxl.Workbook(write_only=True)
+    register_styles(book)
+
+    daily_updates = f"Daily-Updates-{current_date}"
+    daily_updates_sheet = book.create_sheet(daily_updates)
+    set_column_widths(daily_updates_sheet, daily_updates)
+    append_write_only_headers(daily_updates_sheet, daily_updates)
+    add_zebra_striping(daily_updates_sheet)
+    write_only_rows(daily_updates_sheet, daily_updates, daily_updates_rows(store, sources, current_date))
+
+    # The sources without articles have no sheet, as in the Excel file updated by the runs
+    source_stats = {}
+    for source in sources:
+        count, last_article = 0, None
+        for title, link, date in store.articles(source):
+            last_article = last_article or date  # The latest article comes first
+            count += 1
+        if count:
+            source_stats[source] = (count, last_article)
+    sources = list(source_stats)
+    write_index_sheet(book.create_sheet('Index'), source_stats)
+
+    for source in sources:
+        sheet = book.create_sheet(source)
+        set_column_widths(sheet, source)
+        append_write_only_headers(sheet, source)
+        add_zebra_striping(sheet)
+        count = write_only_rows(sheet, source, itertools.islice(store.articles(source), MAX_ARTICLES_PER_SHEET))
+        logging.debug(f"Exported {count} articles of {source}.")
+
+    book.save(path + '.tmp')
+    os.replace(path + '.tmp', path)
+    logging.info(f"Rebuilt the Excel file with {len(sources)} source sheets from the article store.")
@@ -0,0 +1,244 @@
+import logging
+import os
+import time
+
+import openpyxl
+
+from config import SHARD_DIR, SHARDED_OUTPUT, Up_To_Date_NEWS_FILE
+from excel_sheet import create_workbook
+from excel_writer import append_to_excel
+
+
+def daily_updates_path(sheet_name, directory=SHARD_DIR):
+    """
+    Get the path of the Excel file of the month of a 'Daily-Updates' sheet.
+
+    Args:
+        sheet_name (str): The name of the sheet, in the format 'Daily-Updates-dd-mm-yy'.
+        directory (str): The directory of the Excel file.
+
+    Returns:
+        str: The path of the Excel file, in the format 'Daily-Updates-mm-yy.xlsx'.
+    """
+    return os.path.join(directory, f"Daily-Updates-{sheet_name[len('Daily-Updates-') + 3:]}.xlsx")
+
+
+class WorkbookSession:
+    """
+    The Excel workbook of a run, loaded once and saved once.
+
+    Every sheet change of the run (the reset of the 'Daily-Updates' sheet, the articles of every source, the index
+    sheet) is made on the same loaded workbook, which is saved when the session ends without an error. The workbook is
+    saved to a temporary file first and then replaces the old one, so a crash while saving does not corrupt it. The
+    durations of the load and the save are kept in 'timings'.
+    """
+
+    def __init__(self, path=Up_To_Date_NEWS_FILE):
+        self.path = path
+        self.book = None
+        self.timings = {}
+
+    def book_for(self, source):
+        """
+        Get the workbook where the sheet of a source is kept.
+
+        Args:
+            source (str): Source string representing the type of articles.
+
+        Returns:
+            openpyxl.Workbook: The workbook.
+        """
+        return self.book
+
+    def article_count(self, source):
+        """
+        Count the articles in the sheet of a source, below its two header rows.
+
+        Args:
+            source (str): Source string representing the type of articles.
+
+        Returns:
+            int: The number of articles, 0 if the sheet does not exist.
+        """
+        book = self.book_for(source)
+        if source not in book.sheetnames:
+            return 0
+        return max(book[source].max_row - 2, 0)
+
+    def index_links(self):
+        """
+        Get the sheets linked from the index sheet.
+
+        Returns:
+            list: Tuples containing the name of a sheet and the target of its link.
+        """
+        return [(name, f"#'{name}'!A1") for name in self.book.sheetnames
+                if name != 'Index' and not name.startswith('Daily-Updates')]
+
+    def archive_daily_updates(self, sheet_name, directory=SHARD_DIR):
+        """
+        Move a finished 'Daily-Updates' sheet from the workbook to the Excel file of its month.
+
+        The rows of the sheet are written to the archive in one pass, and the archive is saved atomically before the
+        sheet is removed, so the workbook only keeps the sheet of the current day. If the sheet was already archived,
+        e.g. by a run that failed before saving the workbook, it is replaced.
+
+        Args:
+            sheet_name (str): The name of the sheet, in the format 'Daily-Updates-dd-mm-yy'.
+            directory (str): The directory of the archives, the directory of the sharded output by default.
+
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        rows = list(self.book[sheet_name].iter_rows(min_row=3, max_col=3, values_only=True))
+        path = daily_updates_path(sheet_name, directory)
+        archive = openpyxl.load_workbook(path) if os.path.exists(path) else create_workbook()
+        if sheet_name in archive.sheetnames:
+            del archive[sheet_name]
+        append_to_excel(rows, sheet_name, archive)
+        os.makedirs(directory, exist_ok=True)
+        archive.save(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        del self.book[sheet_name]
+        logging.info(f"Archived {len(rows)} articles of '{sheet_name}' to {path} in "
+                     f"{time.perf_counter() - start:.2f} s.")
+
+    def __enter__(self):
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # On an error, the workbook on disk is kept as it was before the run
+        if exc_type is None:
+            self.save()
+        return False
+
+    def load(self):
+        """
+        Load the workbook, or create a new one if the file does not exist yet.
+
+        Returns:
+            openpyxl.Workbook: The workbook.
+        """
+        start = time.perf_counter()
+        if os.path.exists(self.path):
+            self.book = openpyxl.load_workbook(self.path)
+        else:
+            self.book = create_workbook()
+        self.timings['load'] = time.perf_counter() - start
+        return self.book
+
+    def save(self):
+        """
+        Save the workbook atomically.
+
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        self.book.save(self.path + '.tmp')
+        os.replace(self.path + '.tmp', self.path)
+        self.timings['save'] = time.perf_counter() - start
+        logging.info(f"Loaded the workbook in {self.timings['load']:.2f} s and saved it in {self.timings['save']:.2f} s.")
+
+
+class ShardedWorkbookSession(WorkbookSession):
+    """
+    The Excel workbooks of a run, when the output is sharded.
+
+    The sheet of every source is kept in its own workbook in SHARD_DIR, and the 'Daily-Updates' sheets of a month in
+    a workbook of the month. The workbook at the path of the Excel file only has the index sheet, which links to the
+    shards. The shards are loaded when a sheet of theirs is changed, and only those are saved, so a run only touches
+    the shards that received new articles.
+    """
+
+    def __init__(self, path=Up_To_Date_NEWS_FILE, shard_dir=SHARD_DIR):
+        super().__init__(path)
+        self.shard_dir = shard_dir
+        self.shards = {}
+
+    def shard_path(self, source):
+        """
+        Get the path of the workbook where the sheet of a source is kept.
+
+        Args:
+            source (str): Source string representing the type of articles.
+
+        Returns:
+            str: The path of the shard.
+        """
+        if source.startswith('Daily-Updates'):
+            return daily_updates_path(source, self.shard_dir)
+        return os.path.join(self.shard_dir, f"{source}.xlsx")
+
+    def book_for(self, source):
+        path = self.shard_path(source)
+        if path not in self.shards:
+            self.shards[path] = openpyxl.load_workbook(path) if os.path.exists(path) else create_workbook()
+        return self.shards[path]
+
+    def article_count(self, source):
+        path = self.shard_path(source)
+        if path in self.shards or not os.path.exists(path):
+            return super().article_count(source)
+        # A shard that the run does not change is only read, so it is not loaded into the shards that are saved
+        book = openpyxl.load_workbook(path, read_only=True)
+        try:
+            if source not in book.sheetnames:
+                return 0
+            return sum(1 for _ in book[source].iter_rows(min_row=3, values_only=True))
+        finally:
+            book.close()
+
+    def index_links(self):
+        # The shards created in this run are not saved yet
+        paths = set(self.shards)
+        if os.path.isdir(self.shard_dir):
+            paths.update(os.path.join(self.shard_dir, file_name) for file_name in os.listdir(self.shard_dir)
+                         if file_name.endswith('.xlsx'))
+        shard_dir = os.path.relpath(self.shard_dir, os.path.dirname(self.path) or '.')
+        names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        # The sources first, then the months of the 'Daily-Updates' sheets
+        names.sort(key=lambda name: (name.startswith('Daily-Updates'), name))
+        return [(name, os.path.join(shard_dir, f"{name}.xlsx") +
+                 ('' if name.startswith('Daily-Updates') else f"#'{name}'!A1")) for name in names]
+
+    def save(self):
+        """
+        Save the changed shards, and then the index workbook, atomically.
+
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        os.makedirs(self.shard_dir, exist_ok=True)
+        index_link = os.path.join(os.path.relpath(os.path.dirname(self.path) or '.', self.shard_dir),
+                                  os.path.basename(self.path)) + '#Index!A1'
+        for path, book in self.shards.items():
+            for sheet in book.worksheets:
+                # The 'Return to Index' links point to the index workbook
+                if sheet['C1'].value == "Return to Index":
+                    sheet['C1'].hyperlink = index_link
+            book.save(path + '.tmp')
+            os.replace(path + '.tmp', path)
+        super().save()
+        self.timings['save'] = time.perf_counter() - start
+        logging.info(f"Saved {len(self.shards)} shards of the workbook.")
+
+
+#  For a new output layout, add its name with the session class to the below dictionary.
+sessions = {
+    False: WorkbookSession,
+    True: ShardedWorkbookSession,
+}
+
+
+def create_workbook_session():
+    """
+    Create the workbook session of the output selected in the configuration.
+
+    Returns:
+        WorkbookSession or ShardedWorkbookSession: The workbook session.
+    """
+    return sessions[SHARDED_OUTPUT]()